@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark the scan/size/delete engines on an in-memory tree with injected latency.
+
+    python benchmarks/bench_fakefs.py [projects] [latency_ms] [error_rate]
+
+Each project gets a node_modules tree; every filesystem call sleeps latency_ms
+(think slow NFS) and fails with EACCES with probability error_rate. The scan is
+run for several workers_per_device values so the effect of concurrency can be
+compared without building anything on disk.
+"""
+
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+# Runnable from a checkout without installing the package.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from simple_dev_cleaner.cleaner import Config, Scanner  # noqa: E402
+from simple_dev_cleaner.fs import FakeFileSystem  # noqa: E402
+
+OLD = time.time() - 90 * 24 * 3600
+
+
+def build(projects: int, latency: float, error_rate: float) -> FakeFileSystem:
+    fs = FakeFileSystem(error_rate=error_rate, seed=42)
+    for i in range(projects):
+        project = f"/bench/p{i}"
+        fs.add_file(f"{project}/package.json", 300)
+        fs.add_tree(f"{project}/node_modules", depth=3, fanout=4, files=5, atime=OLD)
+        fs.add_tree(f"{project}/src", depth=2, fanout=3, files=4)
+    fs.latency = latency
+    return fs
+
+
+def run(config: Config, projects: int, latency: float, error_rate: float, dry_run: bool) -> None:
+    fs = build(projects, latency, error_rate)
+    started = time.perf_counter()
+    summary = Scanner(config, fs=fs).scan(dry_run=dry_run)
+    elapsed = time.perf_counter() - started
+    errors = sum(1 for r in summary.results if r.get("error"))
+    calls = sum(fs.calls.values())
+    mode = "dry-run" if dry_run else "delete "
+    print(
+        f"  {mode} workers={config.workers_per_device:<3} {elapsed:7.2f}s  "
+        f"{len(summary.results):4} found  {errors:3} errors  {calls:7} fs calls"
+    )
+
+
+def main() -> None:
+    projects = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 0.2) / 1000
+    error_rate = float(sys.argv[3]) if len(sys.argv) > 3 else 0.0
+    base = Config(scan_dirs=["/bench"], target_names=["node_modules"], target_files=[], skip_in_use=False)
+    print(f"{projects} projects, {latency * 1000:g} ms per call, error rate {error_rate:g}")
+    for workers in (1, 4, 16, 64):
+        config = replace(base, workers_per_device=workers)
+        run(config, projects, latency, error_rate, dry_run=True)
+        run(config, projects, latency, error_rate, dry_run=False)
+
+
+if __name__ == "__main__":
+    main()
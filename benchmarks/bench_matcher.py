@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark FileMatcher against a per-pattern fnmatch loop.
+
+    python benchmarks/bench_matcher.py [n_patterns] [n_names]
+"""
+
+import fnmatch
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+# Runnable from a checkout without installing the package.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from simple_dev_cleaner.matcher import FileMatcher  # noqa: E402
+
+
+def _word(rng: random.Random, n: int) -> str:
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(n))
+
+
+def make_patterns(rng: random.Random, n: int) -> list[str]:
+    patterns = [".DS_Store", "Thumbs.db", "*.log", "*.tmp"]
+    while len(patterns) < n:
+        kind = rng.random()
+        if kind < 0.4:
+            patterns.append(f"{_word(rng, 8)}.{_word(rng, 3)}")
+        elif kind < 0.8:
+            patterns.append(f"*.{_word(rng, rng.randint(2, 5))}")
+        else:
+            patterns.append(f"{_word(rng, 3)}*[0-9].{_word(rng, 2)}")
+    return patterns
+
+
+def make_names(rng: random.Random, patterns: list[str], n: int) -> list[str]:
+    literal = [p for p in patterns if "*" not in p]
+    suffixes = [p[1:] for p in patterns if p.startswith("*")]
+    names = []
+    for _ in range(n):
+        kind = rng.random()
+        if kind < 0.05:
+            names.append(rng.choice(literal))
+        elif kind < 0.15:
+            names.append(_word(rng, 6) + rng.choice(suffixes))
+        else:
+            names.append(f"{_word(rng, 7)}.{rng.choice(['py', 'js', 'json', 'md', 'txt'])}")
+    return names
+
+
+def bench(n_patterns: int, n_names: int) -> None:
+    rng = random.Random(n_patterns)
+    patterns = make_patterns(rng, n_patterns)
+    names = make_names(rng, patterns, n_names)
+
+    t0 = time.perf_counter()
+    matcher = FileMatcher(patterns)
+    compile_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    compiled = [m for m in map(matcher.match, names) if m is not None]
+    compiled_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    naive = [n for n in names if any(fnmatch.fnmatchcase(n, p) for p in patterns)]
+    naive_s = time.perf_counter() - t0
+
+    assert len(compiled) == len(naive), (len(compiled), len(naive))
+    print(
+        f"{n_patterns:>5} patterns  {n_names:>7} names  "
+        f"compile {compile_s * 1e3:7.2f} ms  "
+        f"matcher {compiled_s / n_names * 1e9:8.0f} ns/name  "
+        f"fnmatch loop {naive_s / n_names * 1e9:10.0f} ns/name  "
+        f"({naive_s / compiled_s:.0f}x)"
+    )
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    if args:
+        bench(args[0], args[1] if len(args) > 1 else 20_000)
+    else:
+        for n in (4, 100, 300, 1000):
+            bench(n, 20_000)
@@ -1,14 +1,24 @@
 """Paths and config directory (XDG-style)."""
 
+import os
 from pathlib import Path
 
+# Set by system mode for each per-user run (see multiuser.py).
+CONFIG_DIR_ENV = "SDEVCLEAN_CONFIG_DIR"
+
 
 def get_config_dir() -> Path:
     """
     User data directory.
+    $SDEVCLEAN_CONFIG_DIR if set.
     Installed (site-packages): ~/.config/simple-dev-cleaner
     From source: package directory (for development).
     """
+    override = os.environ.get(CONFIG_DIR_ENV)
+    if override:
+        config_dir = Path(override)
+        config_dir.mkdir(parents=True, exist_ok=True)
+        return config_dir
     pkg_dir = Path(__file__).resolve().parent
     if "site-packages" in str(pkg_dir) or "dist-packages" in str(pkg_dir):
         config_home = Path.home() / ".config" / "simple-dev-cleaner"
@@ -21,3 +31,5 @@ CONFIG_DIR = get_config_dir()
 CONFIG_FILE = CONFIG_DIR / "config.toml"
 HISTORY_FILE = CONFIG_DIR / "history.toml"
 LOG_FILE = CONFIG_DIR / "cleaner.log"
+# Defaults for users without their own config.toml in system mode.
+SYSTEM_CONFIG_FILE = Path("/etc/simple-dev-cleaner/config.toml")
@@ -0,0 +1,193 @@
+"""Cold-storage archives: compress a folder into a tarball instead of deleting it, and restore it."""
+
+import hashlib
+import os
+import shutil
+import tarfile
+import time
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import tomllib
+except ImportError:
+    import tomli as tomllib  # type: ignore
+
+import tomli_w
+
+MARKER_SUFFIX = ".sdevclean-archive.toml"
+COMPRESSIONS = {"xz": "tar.xz", "gz": "tar.gz"}
+# Forget per-member headers and the hard link index every N entries so memory
+# stays flat on huge trees; a hard link whose first path was forgotten is stored
+# as a full copy (restored as a separate file).
+_MEMBER_FLUSH = 1000
+_CHUNK = 1024 * 1024
+
+
+class ArchiveError(Exception):
+    pass
+
+
+def marker_for(path: Path) -> Path:
+    """Marker left next to an archived folder, pointing to its archive."""
+    return path.parent / f"{path.name}{MARKER_SUFFIX}"
+
+
+def _archive_name(path: Path, compression: str) -> str:
+    digest = hashlib.sha1(str(path).encode("utf-8")).hexdigest()[:8]
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return f"{path.parent.name}-{path.name}-{digest}-{stamp}.{COMPRESSIONS[compression]}"
+
+
+def _iter_tree(path: Path) -> Iterator[str]:
+    """Every path under `path`, itself first and parents before children; symlinks not followed."""
+    yield str(path)
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames.sort()
+        for name in sorted(filenames):
+            yield os.path.join(dirpath, name)
+        for name in dirnames:
+            yield os.path.join(dirpath, name)
+
+
+def _write_tar(path: Path, dest: Path, compression: str) -> tuple[int, int]:
+    """Stream path into dest. Return (members, bytes of regular files)."""
+    members = 0
+    total = 0
+    with tarfile.open(dest, f"w:{compression}") as tar:
+        for full in _iter_tree(path):
+            arcname = os.path.normpath(os.path.join(path.name, os.path.relpath(full, path)))
+            info = tar.gettarinfo(full, arcname=arcname)
+            if info is None:
+                continue
+            if info.isreg():
+                with open(full, "rb") as f:
+                    tar.addfile(info, f)
+                total += info.size
+            else:
+                tar.addfile(info)
+            members += 1
+            if members % _MEMBER_FLUSH == 0:
+                tar.members.clear()
+                tar.inodes.clear()
+    return members, total
+
+
+def _verify_tar(dest: Path) -> tuple[int, int]:
+    """Read the archive back as a stream (checking compression CRCs). Return (members, bytes)."""
+    members = 0
+    total = 0
+    with tarfile.open(dest, "r|*") as tar:
+        for info in tar:
+            members += 1
+            if info.isreg():
+                f = tar.extractfile(info)
+                if f is not None:
+                    while True:
+                        chunk = f.read(_CHUNK)
+                        if not chunk:
+                            break
+                        total += len(chunk)
+            tar.members = []
+    return members, total
+
+
+def _write_marker(path: Path, data: dict) -> None:
+    marker = marker_for(path)
+    tmp = marker.with_name(f".{marker.name}.{os.getpid()}.tmp")
+    tmp.write_text(tomli_w.dumps(data), encoding="utf-8")
+    os.replace(tmp, marker)
+
+
+def archive_target(path: Path, archive_dir: Path, compression: str = "xz", hours: int = 0) -> Path:
+    """
+    Compress folder `path` into archive_dir, verify it, leave a marker next to
+    it and remove the folder. File contents are streamed, so memory stays bounded.
+    Return the archive path. Raises ArchiveError/OSError; path is left intact if
+    archiving fails, and if removing it fails the marker (removed = false) still
+    points to the archive.
+    """
+    if compression not in COMPRESSIONS:
+        raise ArchiveError(f"Unsupported compression: {compression!r}")
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    dest = archive_dir / _archive_name(path, compression)
+    partial = dest.with_name(dest.name + ".partial")
+    try:
+        written = _write_tar(path, partial, compression)
+        read_back = _verify_tar(partial)
+        if written != read_back:
+            raise ArchiveError(f"Archive verification failed for {path}: wrote {written}, read {read_back}")
+        os.replace(partial, dest)
+    finally:
+        if partial.exists():
+            partial.unlink()
+    data = {
+        "archive": str(dest),
+        "path": str(path),
+        "archived_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "unused_hours": hours,
+        "removed": False,
+    }
+    _write_marker(path, data)
+    shutil.rmtree(path)
+    _write_marker(path, {**data, "removed": True})
+    return dest
+
+
+def _resolve_restore(target: Path) -> tuple[Path, Path, Path, bool]:
+    """(marker, archive, original folder, removed) from a marker or the original folder path."""
+    target = target.expanduser()
+    marker = target if target.name.endswith(MARKER_SUFFIX) else marker_for(target)
+    if not marker.exists():
+        raise ArchiveError(f"No archive marker found: {marker}")
+    with open(marker, "rb") as f:
+        data = tomllib.load(f)
+    # Markers written before the removed flag existed were only written once removal finished.
+    return marker, Path(data["archive"]), Path(data["path"]), data.get("removed", True)
+
+
+def _extract(archive: Path, dest: Path) -> None:
+    """Stream archive into dest without keeping every member's header in memory."""
+    # "tar" rather than "data": venvs hold absolute symlinks (bin/python -> /usr/bin/python3).
+    kwargs = {"filter": "tar"} if hasattr(tarfile, "tar_filter") else {}
+    # Directory modes and times are set last, so read-only directories can be filled first.
+    directories: list[tuple[str, int, float]] = []
+    with tarfile.open(archive, "r|*") as tar:
+        for info in tar:
+            if info.isdir():
+                directories.append((info.name, info.mode, info.mtime))
+            tar.extract(info, dest, set_attrs=not info.isdir(), **kwargs)
+            tar.members = []
+    for name, mode, mtime in sorted(directories, reverse=True):
+        path = os.path.join(dest, name)
+        os.chmod(path, mode & 0o755)
+        os.utime(path, (mtime, mtime), follow_symlinks=False)
+
+
+def restore(target: Path) -> Path:
+    """
+    Stream an archived folder back into place, then drop its archive and marker.
+    A folder whose removal was interrupted (marker with removed = false) is
+    replaced by the full archived copy. Return the folder.
+    """
+    marker, archive, original, removed = _resolve_restore(Path(target))
+    if os.path.lexists(original) and removed:
+        raise ArchiveError(f"Refusing to overwrite existing path: {original}")
+    if not archive.exists():
+        raise ArchiveError(f"Archive not found: {archive}")
+    if os.path.lexists(original):
+        # Partially removed: extract next to it, then swap the leftovers for the full copy.
+        staging = original.parent / f".{original.name}.sdc-restore"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir()
+        try:
+            _extract(archive, staging)
+            shutil.rmtree(original)
+            os.replace(staging / original.name, original)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+    else:
+        _extract(archive, original.parent)
+    marker.unlink()
+    archive.unlink()
+    return original
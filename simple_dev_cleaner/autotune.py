@@ -0,0 +1,196 @@
+"""Worker-count autotuning for the scan and delete pools, remembered per device."""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+try:
+    import tomllib
+except ImportError:
+    import tomli as tomllib  # type: ignore
+
+import tomli_w
+
+from simple_dev_cleaner._config import CONFIG_DIR
+
+AUTOTUNE_FILE = CONFIG_DIR / "autotune.toml"
+# Measurement window (seconds of wall time per adjustment).
+WINDOW = 0.5
+# A step "paid off" if throughput rose by GAIN; it "hurt" if it fell by GAIN.
+GAIN = 0.05
+# Congestion: throughput fell by more than DROP, or per-operation latency grew
+# past LATENCY_FACTOR x the best seen without a gain.
+DROP = 0.15
+LATENCY_FACTOR = 2.0
+# Multiplicative decrease on congestion.
+DECREASE = 0.75
+# The limit only grows while workers were busy this share of it on average.
+BUSY = 0.75
+# Windows a tuner must have measured before its value is remembered.
+MIN_WINDOWS = 4
+MAX_WORKERS = 64
+
+
+class Tuner:
+    """
+    Hill-climbing concurrency limit for one pool. Workers report operations
+    (directory entries listed or sized, files unlinked) and the time spent on
+    them; every WINDOW the throughput is compared with the previous window's:
+    the limit keeps moving in a direction while that pays off (doubling until
+    the first step that doesn't, then by one), steps back when it doesn't, and
+    is cut by DECREASE on congestion. Fewer workers are tried while throughput
+    holds, so it settles at the knee. Windows where the pool ran out of queued
+    work are not judged, and the limit is not raised while the workers it
+    already allows were not kept busy.
+    """
+
+    def __init__(
+        self, start: int, low: int = 1, high: int = MAX_WORKERS, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.low = low
+        self.high = high
+        self.limit = max(low, min(high, int(start)))
+        self.windows = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._window_start = clock()
+        self._ops = 0
+        self._busy = 0.0
+        self._starved = False
+        self._last_tput: Optional[float] = None
+        self._last_step = 0
+        self._slow_start = True
+        self._base_latency: Optional[float] = None
+        # limit -> smoothed throughput (ops/s) seen at that limit.
+        self._tput: dict[int, float] = {}
+
+    def record(self, ops: int, seconds: float) -> None:
+        """Report ops done in seconds by one worker."""
+        with self._lock:
+            self._ops += ops
+            self._busy += seconds
+            now = self._clock()
+            elapsed = now - self._window_start
+            if elapsed < WINDOW:
+                return
+            if self._ops and not self._starved:
+                self._adjust(self._ops / elapsed, self._busy / self._ops, self._busy / elapsed)
+            self._window_start = now
+            self._ops = 0
+            self._busy = 0.0
+            self._starved = False
+
+    def starved(self) -> None:
+        """The pool had free slots and nothing queued during this window."""
+        self._starved = True
+
+    def _adjust(self, tput: float, latency: float, in_use: float) -> None:
+        self.windows += 1
+        seen = self._tput.get(self.limit)
+        self._tput[self.limit] = tput if seen is None else (seen + tput) / 2
+        if self._base_latency is None or latency < self._base_latency:
+            self._base_latency = latency
+        prev = self._last_tput
+        change = tput / prev - 1 if prev else 0.0
+        limit = self.limit
+        if prev is None:
+            target = limit * 2
+        elif change < -DROP or (latency > self._base_latency * LATENCY_FACTOR and change < GAIN):
+            self._slow_start = False
+            target = min(limit - 1, int(limit * DECREASE))
+        elif self._last_step > 0:
+            if change >= GAIN:
+                target = limit * 2 if self._slow_start else limit + 1
+            else:
+                self._slow_start = False
+                target = limit - 1
+        elif self._last_step < 0:
+            # Fewer workers: go on while throughput holds, step back if it hurt.
+            target = limit + 1 if change <= -GAIN else limit - 1
+        else:
+            target = limit + 1
+        if target > limit and in_use < limit * BUSY:
+            target = limit
+        self.limit = max(self.low, min(self.high, target))
+        self._last_step = self.limit - limit
+        self._last_tput = tput
+
+    @property
+    def settled(self) -> int:
+        """The smallest limit within GAIN of the best measured throughput (the current one if none was)."""
+        with self._lock:
+            if not self._tput:
+                return self.limit
+            best = max(self._tput.values())
+            return min(limit for limit, tput in self._tput.items() if tput >= best * (1 - GAIN))
+
+
+def mount_point(path: str) -> str:
+    """Mount point of the filesystem holding path (the key tuned values are stored under)."""
+    path = os.path.abspath(path)
+    while not os.path.ismount(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path
+
+
+class TunerSet:
+    """
+    One Tuner per device for a kind of pool ("scan" or "delete"). Each starts
+    from the value remembered for its mount point, or default. Devices with a
+    pinned limit (device_workers) are not tuned.
+    """
+
+    def __init__(
+        self, kind: str, default: int, pinned: Optional[dict[int, int]] = None, path: Path = AUTOTUNE_FILE
+    ) -> None:
+        self.kind = kind
+        self.default = default
+        self.pinned = pinned or {}
+        self.path = Path(path)
+        self._saved: dict[str, int] = _load(self.path).get(kind, {})
+        self._lock = threading.Lock()
+        self._tuners: dict[int, tuple[str, Tuner]] = {}
+
+    def for_device(self, dev: int, path: str) -> Optional[Tuner]:
+        """The tuner of dev, created on first use; path is any path on that device."""
+        if dev in self.pinned:
+            return None
+        with self._lock:
+            item = self._tuners.get(dev)
+            if item is None:
+                mount = mount_point(path)
+                item = self._tuners[dev] = (mount, Tuner(self._saved.get(mount, self.default)))
+            return item[1]
+
+    def get(self, dev: int) -> Optional[Tuner]:
+        item = self._tuners.get(dev)
+        return item[1] if item is not None else None
+
+    def limits(self) -> dict[str, int]:
+        """Current limit per mount point (for display)."""
+        return {mount: tuner.limit for mount, tuner in self._tuners.values()}
+
+    def save(self) -> None:
+        """Remember each tuner's settled value, keeping other kinds and mount points."""
+        learned = {mount: tuner.settled for mount, tuner in self._tuners.values() if tuner.windows >= MIN_WINDOWS}
+        if not learned:
+            return
+        data = _load(self.path)
+        data.setdefault(self.kind, {}).update(learned)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(tomli_w.dumps(data), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+def _load(path: Path) -> dict[str, dict[str, int]]:
+    try:
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    except (OSError, ValueError):
+        return {}
@@ -0,0 +1,217 @@
+"""Global package caches: keep each under a size cap by evicting least recently used entries."""
+
+import glob
+import os
+import shutil
+import stat
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, Optional
+
+from simple_dev_cleaner._config import LOG_FILE
+from simple_dev_cleaner.inuse import InUseIndex
+
+_MB = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class CacheSpec:
+    """
+    A known cache: candidate locations relative to home (first existing wins) and
+    its eviction units as (subdir, depth). Depth N evicts whole entries N levels
+    below subdir (a package version, an unpacked archive); depth 0 evicts single
+    files at any depth (content-addressed blobs). subdir may be a glob pattern, for
+    caches that version their bucket names (uv's wheels-v5, simple-v15, ...).
+    """
+    name: str
+    paths: tuple[str, ...]
+    units: tuple[tuple[str, int], ...]
+
+
+KNOWN_CACHES: dict[str, CacheSpec] = {
+    spec.name: spec
+    for spec in (
+        CacheSpec("npm", (".npm/_cacache",), (("content-v2", 0), ("index-v5", 0))),
+        CacheSpec("pip", (".cache/pip", "Library/Caches/pip"), (("http-v2", 0), ("http", 0), ("wheels", 0))),
+        CacheSpec(
+            "uv",
+            (".cache/uv", "Library/Caches/uv"),
+            (
+                # Unpacked wheels, one per hash.
+                ("archive-v*", 1),
+                # Built/downloaded wheels, source dists and index metadata: one unit
+                # per package (pypi) or per index, URL, path or git source.
+                ("wheels-v*/pypi", 1), ("wheels-v*/index/*", 1), ("wheels-v*/url", 1), ("wheels-v*/path", 1),
+                ("sdists-v*/pypi", 1), ("sdists-v*/index/*", 1), ("sdists-v*/url", 1), ("sdists-v*/path", 1),
+                ("sdists-v*/git", 1),
+                ("simple-v*/pypi", 1), ("simple-v*/index/*", 1),
+                ("git-v*/checkouts", 1), ("git-v*/db", 1),
+                ("builds-v*", 1), ("environments-v*", 1),
+            ),
+        ),
+        CacheSpec("cargo", (".cargo/registry",), (("cache", 2), ("src", 2))),
+        CacheSpec(
+            "gradle",
+            (".gradle/caches",),
+            (("modules-2/files-2.1", 3), ("transforms-3", 1), ("transforms-4", 1)),
+        ),
+    )
+}
+
+
+@dataclass
+class _Entry:
+    path: str
+    is_dir: bool
+    size: int
+    last_used: float
+
+
+@dataclass
+class CacheReport:
+    name: str
+    path: str
+    entries: int = 0
+    size_mb: float = 0.0
+    cap_mb: float = 0.0
+    evicted: int = 0
+    evicted_mb: float = 0.0
+    dry_run: bool = True
+    errors: list[str] = field(default_factory=list)
+
+
+def cache_path(spec: CacheSpec, home: Optional[Path] = None) -> Optional[Path]:
+    home = home or Path.home()
+    for rel in spec.paths:
+        path = home / rel
+        if path.is_dir():
+            return path
+    return None
+
+
+def _tree_usage(path: str) -> tuple[int, float]:
+    """(bytes, last access) of everything under path, symlinks not followed."""
+    total = 0
+    last = 0.0
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if stat.S_ISDIR(st.st_mode):
+                        stack.append(entry.path)
+                        continue
+                    total += st.st_size
+                    last = max(last, st.st_atime, st.st_mtime)
+        except OSError:
+            continue
+    return total, last
+
+
+def _unit_roots(root: Path, sub: str) -> list[str]:
+    """Directories a unit's subdir (a path or a glob pattern) names under root."""
+    if not any(c in sub for c in "*?["):
+        return [str(root / sub)]
+    return sorted(p for p in glob.glob(os.path.join(glob.escape(str(root)), sub)) if os.path.isdir(p))
+
+
+def _unit_entries(root: str, depth: int) -> Iterator[_Entry]:
+    """Eviction entries under root: subtrees `depth` levels down, or every file with depth 0."""
+    stack = [(root, 0)]
+    while stack:
+        current, level = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            is_dir = stat.S_ISDIR(st.st_mode)
+            if depth and level + 1 == depth:
+                if is_dir:
+                    size, last = _tree_usage(entry.path)
+                    yield _Entry(entry.path, True, size, max(last, st.st_mtime))
+                else:
+                    yield _Entry(entry.path, False, st.st_size, max(st.st_atime, st.st_mtime))
+            elif is_dir:
+                stack.append((entry.path, level + 1))
+            elif not depth:
+                yield _Entry(entry.path, False, st.st_size, max(st.st_atime, st.st_mtime))
+
+
+def cap_cache(
+    spec: CacheSpec, cap_mb: float, dry_run: bool = True, in_use: Optional[InUseIndex] = None
+) -> Optional[CacheReport]:
+    """
+    Walk one cache once and evict its least recently used entries until it fits
+    cap_mb. Entries held by a running process are kept. None if the cache is absent.
+    """
+    root = cache_path(spec)
+    if root is None:
+        return None
+    entries = [e for sub, depth in spec.units for base in _unit_roots(root, sub) for e in _unit_entries(base, depth)]
+    entries.sort(key=lambda e: e.last_used)
+    total = sum(e.size for e in entries)
+    report = CacheReport(
+        spec.name, str(root), len(entries), round(total / _MB, 1), cap_mb, dry_run=dry_run
+    )
+    cap = cap_mb * _MB
+    evicted_bytes = 0
+    for entry in entries:
+        if total <= cap:
+            break
+        if in_use is not None and in_use.holder(entry.path):
+            continue
+        if not dry_run:
+            try:
+                if entry.is_dir:
+                    shutil.rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
+            except OSError as e:
+                report.errors.append(f"{entry.path}: {e}")
+                continue
+        total -= entry.size
+        evicted_bytes += entry.size
+        report.evicted += 1
+    report.evicted_mb = round(evicted_bytes / _MB, 1)
+    return report
+
+
+def cap_caches(caps: dict[str, float], dry_run: bool = True) -> list[CacheReport]:
+    """Apply cache_caps ({cache name: cap in MB}) to every known cache present on this machine."""
+    in_use = InUseIndex.snapshot()
+    reports = []
+    for name, cap_mb in caps.items():
+        spec = KNOWN_CACHES.get(name)
+        if spec is None:
+            continue
+        report = cap_cache(spec, float(cap_mb), dry_run, in_use)
+        if report is not None:
+            reports.append(report)
+    return reports
+
+
+def write_cache_log(reports: list[CacheReport]) -> None:
+    if not reports:
+        return
+    mode = "CACHE-CAP (dry run)" if reports[0].dry_run else "CACHE-CAP"
+    lines = [f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {mode}"]
+    for r in reports:
+        lines.append(
+            f"  [{r.name}] {r.path}: {r.size_mb}MB / cap {r.cap_mb}MB — "
+            f"evicted {r.evicted} entries ({r.evicted_mb}MB), {len(r.errors)} errors"
+        )
+    lines.append("")
+    with open(LOG_FILE, "a", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
@@ -1,11 +1,15 @@
 """Development dependency cleanup engine."""
 
+import heapq
 import os
 import shutil
+import threading
 import time
-from dataclasses import dataclass, field, asdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field, asdict, replace
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional, Sequence
 
 try:
     import tomllib
@@ -15,6 +19,27 @@ except ImportError:
 import tomli_w
 
 from simple_dev_cleaner._config import CONFIG_DIR, CONFIG_FILE, HISTORY_FILE, LOG_FILE
+from simple_dev_cleaner.archive import archive_target
+from simple_dev_cleaner.autotune import MAX_WORKERS, Tuner, TunerSet
+from simple_dev_cleaner.caches import cap_caches, write_cache_log
+from simple_dev_cleaner.detectors import Detector, dispatch_table
+from simple_dev_cleaner.fs import LOCAL, FileSystem, entry_inode
+from simple_dev_cleaner.inuse import InUseIndex
+from simple_dev_cleaner.lock import LiveFeed, LockBusy, history_lock, run_lock
+from simple_dev_cleaner.metrics import write_textfile
+from simple_dev_cleaner.regrowth import MARKER_NAME, RegrowthLog, detect, record_regrowths
+from simple_dev_cleaner.rules import DeleteRule, parse_rules
+from simple_dev_cleaner.usage import BREAKDOWN_DEPTH, forget_deleted
+from simple_dev_cleaner.venvsize import record_size
+from simple_dev_cleaner.matcher import FileMatcher
+from simple_dev_cleaner.walker import (
+    DeviceScheduler,
+    ScanStats,
+    YieldIndex,
+    child_device,
+    device_of,
+    normalize_roots,
+)
 
 APP_DIR = CONFIG_DIR
 CONFIG_PATH = CONFIG_FILE
@@ -64,20 +89,85 @@ class Config:
     unused_hours: int = 48
     enabled: bool = True
     lang: str = "es"
+    # Don't cross mount points (st_dev boundaries) while walking or sizing.
+    one_file_system: bool = True
+    # Concurrent directory listings/sizings per device; device_workers overrides
+    # it per device, keyed by any path on that device (e.g. "/Volumes/USB" = 1).
+    workers_per_device: int = 4
+    device_workers: dict[str, int] = field(default_factory=dict)
+    # What to do with stale folders: "delete", or "archive" into a compressed
+    # tarball in archive_dir (default: <config dir>/archives) that `sdevclean restore` brings back.
+    action: str = "delete"
+    archive_dir: str = ""
+    archive_compression: str = "xz"
+    # Scheduled runs: skip entirely while every scanned filesystem has more than
+    # watermark_high_pct % free; otherwise clean (stalest first) until it has
+    # watermark_target_pct % free. 0 disables the policy (always clean everything).
+    watermark_high_pct: float = 0.0
+    watermark_target_pct: float = 0.0
+    # Leave targets alone while a running process has its cwd, executable,
+    # an open file or a mapped library inside them (Linux /proc only).
+    skip_in_use: bool = True
+    # node_exporter textfile-collector file rewritten after every run ("" = off),
+    # e.g. "/var/lib/node_exporter/textfile_collector/sdevclean.prom".
+    metrics_file: str = ""
+    # Stop walking after this many seconds (0 = walk everything). Directories
+    # where past runs found the most are visited first.
+    scan_time_budget: float = 0.0
+    # Also report the top_k largest stale files of at least min_size_mb found
+    # anywhere in the walk (core dumps, disk images, DB dumps); {} = off.
+    # E.g. {min_size_mb = 1024, top_k = 20}.
+    large_files: dict[str, float] = field(default_factory=dict)
+    # Global package caches to keep under a size cap (MB) by evicting least
+    # recently used entries, e.g. {npm = 2048, pip = 1024}. Known caches:
+    # npm, pip, uv, cargo, gradle. Applied by scheduled runs and `sdevclean caches`.
+    cache_caps: dict[str, float] = field(default_factory=dict)
+    # Interactive clean: results matching any of these rules are deleted while
+    # the scan is still running (after one confirmation), the rest are reviewed
+    # as usual. Keys: name, ecosystem, min_days, min_size_mb; e.g.
+    # [{name = "node_modules", min_days = 30}, {min_size_mb = 500}].
+    auto_delete_rules: list[dict] = field(default_factory=list)
+    # Threads deleting in parallel with the walk (pipelined clean).
+    delete_workers: int = 4
+    # Stat (sizing) and unlink (deleting) each directory's entries in inode
+    # order, a directory at a time: far less seeking on HDDs and some NFS servers.
+    inode_order: bool = False
+    # Size Python venvs from their packages' dist-info RECORD files (a few
+    # reads instead of a stat per file); a sample of files is stat'ed to catch
+    # packages changed since install, which are walked instead.
+    record_sizing: bool = True
+    # Adjust the scan and delete thread counts per device while running, from
+    # measured throughput and latency; the value that worked best is remembered
+    # per mount point (autotune.toml) and used as the next run's start.
+    # workers_per_device and delete_workers are the first run's start;
+    # devices listed in device_workers keep their fixed limit.
+    autotune: bool = False
+    # Targets found reinstalled soon after being deleted (next to the marker
+    # their deletion left) raise their project's unused_hours to cover how long
+    # it sat idle before it was needed again (regrowth.toml).
+    regrowth_aware: bool = True
 
     def save(self) -> None:
         data = {"config": asdict(self)}
         _save_toml(CONFIG_PATH, data)
 
+    @classmethod
+    def from_file(cls, path: Path) -> Optional["Config"]:
+        """Config read from a TOML file, or None if it is missing or unreadable."""
+        if not path.exists():
+            return None
+        try:
+            data = _load_toml(path)
+            cfg = data.get("config") or data
+            return cls(**{k: v for k, v in cfg.items() if k in cls.__dataclass_fields__})
+        except Exception:
+            return None
+
     @classmethod
     def load(cls) -> "Config":
-        if CONFIG_PATH.exists():
-            try:
-                data = _load_toml(CONFIG_PATH)
-                cfg = data.get("config") or data
-                return cls(**{k: v for k, v in cfg.items() if k in cls.__dataclass_fields__})
-            except Exception:
-                pass
+        cfg = cls.from_file(CONFIG_PATH)
+        if cfg is not None:
+            return cfg
         # Migration from config.json (previous versions)
         legacy_path = CONFIG_PATH.with_suffix(".json")
         if legacy_path.exists():
@@ -104,6 +194,12 @@ class CleanResult:
     deleted: bool
     is_file: bool = False
     error: Optional[str] = None
+    ecosystem: str = ""
+    # Why the target was left alone: "in_use" by a running process, or
+    # "changed"/"missing" since a plan was made.
+    skipped: Optional[str] = None
+    archive: Optional[str] = None
+    root: str = ""
 
 
 @dataclass
@@ -112,19 +208,22 @@ class RunSummary:
     results: list[dict]
     total_freed_mb: float
     dry_run: bool
+    # True when the walk stopped early (deadline or space goal reached).
+    partial: bool = False
 
     def save(self) -> None:
-        history: list[dict] = []
-        if HISTORY_FILE.exists():
-            try:
-                data = _load_toml(HISTORY_FILE)
-                history = data.get("runs", [])
-            except Exception:
-                pass
-        run_dict = asdict(self)
-        history.insert(0, run_dict)
-        history = history[:50]
-        _save_toml(HISTORY_FILE, {"runs": history})
+        with history_lock():
+            history: list[dict] = []
+            if HISTORY_FILE.exists():
+                try:
+                    data = _load_toml(HISTORY_FILE)
+                    history = data.get("runs", [])
+                except Exception:
+                    pass
+            run_dict = asdict(self)
+            history.insert(0, run_dict)
+            history = history[:50]
+            _save_toml(HISTORY_FILE, {"runs": history})
 
     @staticmethod
     def load_last() -> Optional[dict]:
@@ -166,145 +265,690 @@ class RunSummary:
         return []
 
 
-def _is_real_dep(path: Path) -> bool:
-    name = path.name
-    parent = path.parent
-    if name == "node_modules":
-        return (parent / "package.json").exists()
-    if name in ("venv", ".venv", "env", "ENV", "env.bak", "venv.bak"):
-        return (path / "bin" / "activate").exists() or (path / "pyvenv.cfg").exists()
-    return False
-
-
 def _is_nested_node_modules(path: Path) -> bool:
     return path.parts.count("node_modules") > 1
 
 
-def _unused_hours(path: Path) -> int:
+def _unused_hours(path: Path, fs: FileSystem = LOCAL) -> int:
     try:
-        atime = path.stat().st_atime
+        atime = fs.stat(str(path)).st_atime
         return int((time.time() - atime) / 3600)
     except OSError:
         return 0
 
 
-def _dir_size_mb(path: Path) -> float:
+def _dir_size_mb(
+    path: Path,
+    one_file_system: bool = True,
+    stats: Optional[ScanStats] = None,
+    inode_order: bool = False,
+    fs: FileSystem = LOCAL,
+    own: Optional[dict[str, int]] = None,
+    tuner: Optional[Tuner] = None,
+    dirs: Optional[list[tuple[str, int]]] = None,
+) -> float:
+    """
+    Size of a folder in MB, symlinks not followed. With own, the bytes of the files
+    directly in each directory down to BREAKDOWN_DEPTH (deeper ones count towards
+    their ancestor at that depth) are added to it, keyed by directory path.
+    Entries sized per directory are reported to tuner; with dirs, every directory
+    walked is appended to it with its mtime_ns.
+    """
     total = 0
     try:
-        for entry in path.rglob("*"):
+        root = fs.lstat(str(path))
+    except OSError:
+        return 0.0
+    root_dev = root.st_dev
+    if dirs is not None:
+        dirs.append((str(path), root.st_mtime_ns))
+    stack = [(str(path), 0, str(path))]
+    while stack:
+        current, depth, unit = stack.pop()
+        batch = 0
+        entries = 0
+        started = time.perf_counter()
+        try:
+            listing = fs.scandir(current)
+        except OSError:
+            continue
+        if inode_order:
+            listing.sort(key=entry_inode)
+        for entry in listing:
+            entries += 1
             try:
-                if entry.is_file(follow_symlinks=False):
-                    total += entry.stat(follow_symlinks=False).st_size
+                if entry.is_dir(follow_symlinks=False):
+                    if one_file_system and child_device(entry) != root_dev:
+                        continue
+                    stack.append((entry.path, depth + 1, entry.path if depth < BREAKDOWN_DEPTH else unit))
+                    if dirs is not None:
+                        dirs.append((entry.path, entry.stat(follow_symlinks=False).st_mtime_ns))
+                elif entry.is_file(follow_symlinks=False):
+                    batch += entry.stat(follow_symlinks=False).st_size
             except OSError:
                 continue
-    except OSError:
-        pass
+        total += batch
+        if own is not None and batch:
+            own[unit] = own.get(unit, 0) + batch
+        if stats is not None:
+            stats.add_dir(entries, batch)
+        if tuner is not None:
+            tuner.record(entries, time.perf_counter() - started)
     return total / (1024 * 1024)
 
 
-def scan(config: Config, dry_run: bool = True, progress_cb=None) -> RunSummary:
-    results: list[CleanResult] = []
-    total_freed = 0.0
+def _write_marker(path: Path, hours: int, fs: FileSystem = LOCAL) -> None:
+    fs.write_text(
+        str(path.parent / MARKER_NAME),
+        f"Folder '{path.name}' removed by Simple Dev Cleaner "
+        f"(unused for {hours}h). Reinstall dependencies.\n"
+    )
+
+
+def archive_dir(config: Config) -> Path:
+    return Path(config.archive_dir).expanduser() if config.archive_dir else APP_DIR / "archives"
+
+
+def _delete_target(
+    path: Path,
+    is_file: bool,
+    hours: int,
+    config: Optional[Config] = None,
+    fs: FileSystem = LOCAL,
+    tuner: Optional[Tuner] = None,
+) -> Optional[str]:
+    """
+    Delete a file, or a folder plus its install_packages_again marker. With
+    config.action == "archive", folders are archived instead (local filesystem
+    only); return the archive path. Raises on failure.
+    """
+    if is_file:
+        fs.unlink(str(path))
+        return None
+    if config is not None and config.action == "archive":
+        return str(archive_target(path, archive_dir(config), config.archive_compression, hours))
+    inode_order = config is not None and config.inode_order
+    fs.rmtree(str(path), inode_order, tuner.record if tuner is not None else None)
+    _write_marker(path, hours, fs)
+    return None
+
+
+def _in_use_index(config: Optional[Config]) -> InUseIndex:
+    """One /proc snapshot for a run (empty when the guard is disabled)."""
+    if config is not None and not config.skip_in_use:
+        return InUseIndex()
+    return InUseIndex.snapshot()
+
+
+@dataclass
+class _DirVisit:
+    """What a single directory listing produced for the scan."""
+    dev: int
+    dirs: list[tuple[Path, str]] = field(default_factory=list)
+    files: list[Path] = field(default_factory=list)
+    subdirs: list[tuple[str, int]] = field(default_factory=list)
+    # (size, path) of stale files over large_files.min_size_mb.
+    large: list[tuple[int, str]] = field(default_factory=list)
+
+
+# large_files defaults when the table omits a key.
+_LARGE_FILES_MIN_MB = 1024
+_LARGE_FILES_TOP_K = 20
+
+
+def _large_files_settings(config: Config) -> tuple[int, int]:
+    """(min size in bytes, top_k) of the large_files target; (0, 0) when disabled."""
+    if not config.large_files:
+        return 0, 0
+    min_mb = float(config.large_files.get("min_size_mb", _LARGE_FILES_MIN_MB))
+    top_k = int(config.large_files.get("top_k", _LARGE_FILES_TOP_K))
+    if top_k <= 0:
+        return 0, 0
+    return max(1, int(min_mb * 1024 * 1024)), top_k
+
+
+def _device_limits(config: Config, fs: FileSystem = LOCAL) -> dict[int, int]:
+    """Map device_workers (path -> limit) to st_dev -> limit."""
+    limits: dict[int, int] = {}
+    for path, limit in (getattr(config, "device_workers", None) or {}).items():
+        dev = device_of(Path(path).expanduser(), fs)
+        if dev is not None:
+            limits[dev] = int(limit)
+    return limits
+
+
+# Sizing/deleting found targets goes ahead of walking further.
+_RESULTS_FIRST = float("-inf")
 
-    for scan_dir in config.scan_dirs:
-        scan_path = Path(scan_dir).expanduser()
-        if not scan_path.is_dir():
-            continue
 
-        for target_name in config.target_names:
+# A sink receives each finished summary (and the walk stats), e.g. to persist it.
+Sink = Callable[[RunSummary, ScanStats], None]
+
+
+def history_sink(summary: RunSummary, stats: ScanStats) -> None:
+    summary.save()
+
+
+def log_sink(summary: RunSummary, stats: ScanStats) -> None:
+    _write_log(summary)
+
+
+def metrics_sink(path: "str | os.PathLike[str]") -> Sink:
+    """Sink writing the run's metrics to a Prometheus textfile at path."""
+    def sink(summary: RunSummary, stats: ScanStats) -> None:
+        phases = {"walk": stats.elapsed, **stats.phases}
+        mode = "dry_run" if summary.dry_run else "clean"
+        write_textfile(Path(path), summary.results, mode, phases, stats.dirs_by_root)
+    return sink
+
+
+def usage_sink(summary: RunSummary, stats: ScanStats) -> None:
+    """Save the walk's size index for the explorer (runs that did not walk leave it alone)."""
+    if not stats.usage.roots:
+        forget_deleted(summary.results)
+        return
+    for r in summary.results:
+        if r.get("deleted"):
+            stats.usage.remove(r["path"])
+    stats.usage.save()
+
+
+def regrowth_sink(summary: RunSummary, stats: ScanStats) -> None:
+    """Remember the targets the walk found reinstalled since their deletion."""
+    record_regrowths(stats.regrown)
+
+
+def default_sinks(config: Config, metrics: bool = True) -> list[Sink]:
+    """History, log, size index and regrowths, plus the metrics textfile when config.metrics_file is set."""
+    sinks: list[Sink] = [history_sink, log_sink, usage_sink, regrowth_sink]
+    if metrics and config.metrics_file:
+        sinks.append(metrics_sink(config.metrics_file))
+    return sinks
+
+
+class Scanner:
+    """
+    Reusable scan engine built from a Config.
+    The detector table, the compiled file matcher, the marker-check cache and the
+    folder size cache live as long as the Scanner, so repeated scans in one
+    process only redo the walk. Nothing is persisted unless sinks are given
+    (see history_sink and log_sink). fs is the filesystem backend (e.g. a
+    FakeFileSystem for benchmarks); the in-use guard only sees the real /proc.
+    """
+
+    def __init__(self, config: Config, sinks: Sequence[Sink] = (), fs: FileSystem = LOCAL) -> None:
+        self.config = config
+        self.sinks: list[Sink] = list(sinks)
+        self.fs = fs
+        self.dispatch = dispatch_table(config.target_names)
+        self.matcher = FileMatcher(getattr(config, "target_files", None) or [])
+        # (folder path, inode, mtime_ns) -> {detector: found} for the checks that look
+        # inside the folder; the mtime changes when entries are added or removed.
+        self._marker_cache: dict[tuple[str, int, int], dict[Detector, bool]] = {}
+        # (dev, ino) of a folder -> (size in MB, breakdown for the usage index, the
+        # mtime_ns of every directory sized). Reused only while none of those
+        # directories changed: new, removed or renamed files anywhere below show up,
+        # files rewritten in place do not.
+        self._size_cache: dict[tuple[int, int], tuple[float, dict[str, int], list[tuple[str, int]]]] = {}
+        # Per-directory yield scores from history, loaded on first scan.
+        self._yields: Optional[YieldIndex] = None
+        # Per-device worker tuners of the running scan (config.autotune).
+        self._tuners: Optional[TunerSet] = None
+        # Past regrowths (config.regrowth_aware), loaded on first scan.
+        self._regrowth: Optional[RegrowthLog] = None
+
+    def clear_caches(self) -> None:
+        self._marker_cache.clear()
+        self._size_cache.clear()
+        self._yields = None
+        self._regrowth = None
+
+    def _detect(
+        self, entry: os.DirEntry, detectors: tuple[Detector, ...], parent_names: frozenset[str]
+    ) -> Optional[Detector]:
+        for detector in detectors:
+            if detector.validate is not None:
+                confirmed = detector.validate(entry.path, parent_names)
+            elif detector.matches_siblings(parent_names):
+                confirmed = True
+            elif detector.inside:
+                key = (entry.path, entry.inode(), entry.stat(follow_symlinks=False).st_mtime_ns)
+                cache = self._marker_cache.get(key)
+                if cache is None:
+                    cache = self._marker_cache[key] = {}
+                confirmed = cache.get(detector)
+                if confirmed is None:
+                    confirmed = cache[detector] = detector.matches_inside(entry.path, self.fs.exists)
+            else:
+                confirmed = False
+            if confirmed:
+                return detector
+        return None
+
+    def _visit_dir(
+        self, path: str, dev: int, matcher: FileMatcher, stats: Optional[ScanStats] = None, large_min: int = 0
+    ) -> _DirVisit:
+        """
+        List one directory: collect candidate folders/files and the subdirectories to descend.
+        With large_min (bytes), other regular files are stat'ed to collect stale ones at least that big.
+        """
+        visit = _DirVisit(dev)
+        started = time.perf_counter()
+        try:
+            entries = self.fs.scandir(path)
+        except OSError:
+            return visit
+        if stats is not None:
+            stats.add_dir(len(entries))
+        one_file_system = self.config.one_file_system
+        stale_before = time.time() - self.config.unused_hours * 3600
+        parent_names: Optional[frozenset[str]] = None
+        for entry in entries:
+            name = entry.name
             try:
-                matches = list(scan_path.rglob(target_name))
-            except PermissionError:
+                if entry.is_dir(follow_symlinks=False):
+                    detectors = self.dispatch.get(name)
+                    if detectors:
+                        if parent_names is None:
+                            parent_names = frozenset(e.name for e in entries)
+                        detector = self._detect(entry, detectors, parent_names)
+                        found = Path(entry.path)
+                        if detector is not None and not _is_nested_node_modules(found):
+                            visit.dirs.append((found, detector.ecosystem))
+                            continue
+                    sub_dev = child_device(entry)
+                    if sub_dev is None or (one_file_system and sub_dev != dev):
+                        continue
+                    visit.subdirs.append((entry.path, sub_dev))
+                elif matcher and matcher.match(name) is not None and entry.is_file():
+                    visit.files.append(Path(entry.path))
+                elif large_min and entry.is_file(follow_symlinks=False):
+                    # Hard-linked files free nothing when one name is removed.
+                    st = entry.stat(follow_symlinks=False)
+                    if st.st_size >= large_min and st.st_nlink == 1 and st.st_atime <= stale_before:
+                        visit.large.append((st.st_size, entry.path))
+            except OSError:
                 continue
+        tuner = self._tuners.get(dev) if self._tuners is not None else None
+        if tuner is not None:
+            tuner.record(len(entries), time.perf_counter() - started)
+        return visit
 
-            for found in matches:
-                if not found.is_dir():
-                    continue
-                if _is_nested_node_modules(found):
-                    continue
-                if not _is_real_dep(found):
-                    continue
-
-                hours = _unused_hours(found)
-                if hours < config.unused_hours:
-                    continue
-
-                size = _dir_size_mb(found)
-                result = CleanResult(
-                    path=str(found),
-                    name=found.name,
-                    size_mb=round(size, 1),
-                    unused_hours=hours,
-                    deleted=False,
-                    is_file=False,
-                )
+    def _size_mb(self, found: Path, stats: Optional[ScanStats]) -> tuple[float, dict[str, int]]:
+        """Size in MB and per-directory bytes (see _dir_size_mb)."""
+        try:
+            st = self.fs.lstat(str(found))
+            key: Optional[tuple[int, int]] = (st.st_dev, st.st_ino)
+        except OSError:
+            key = None
+        cached = self._size_cache.get(key) if key is not None else None
+        if cached is not None and self._unchanged(cached[2]):
+            return cached[0], cached[1]
+        tuner = self._tuners.get(key[0]) if self._tuners is not None and key is not None else None
+        started = time.perf_counter()
+        own: dict[str, int] = {}
+        dirs: list[tuple[str, int]] = []
+        size = None
+        if self.config.record_sizing and self.fs.exists(str(found / "pyvenv.cfg")):
+            size = self._record_size_mb(found, stats, own, tuner, dirs)
+        if size is None:
+            dirs.clear()
+            size = _dir_size_mb(
+                found, self.config.one_file_system, stats, self.config.inode_order, self.fs, own, tuner, dirs
+            )
+        if stats is not None:
+            stats.add_phase("size", time.perf_counter() - started)
+        if key is not None:
+            self._size_cache[key] = (size, own, dirs)
+        return size, own
 
-                if not dry_run:
-                    try:
-                        shutil.rmtree(found)
-                        marker = found.parent / "install_packages_again"
-                        marker.write_text(
-                            f"Folder '{found.name}' removed by Simple Dev Cleaner "
-                            f"(unused for {hours}h). Reinstall dependencies.\n"
-                        )
-                        result.deleted = True
-                        total_freed += size
-                    except Exception as e:
-                        result.error = str(e)
+    def _unchanged(self, dirs: list[tuple[str, int]]) -> bool:
+        """Whether every directory recorded while sizing still has the same mtime (one lstat each)."""
+        for path, mtime_ns in dirs:
+            try:
+                if self.fs.lstat(path).st_mtime_ns != mtime_ns:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def _record_size_mb(
+        self,
+        venv: Path,
+        stats: Optional[ScanStats],
+        own: dict[str, int],
+        tuner: Optional[Tuner] = None,
+        dirs: Optional[list[tuple[str, int]]] = None,
+    ) -> Optional[float]:
+        """Venv size from RECORD files (see venvsize.record_size); None to walk it instead."""
+        walked = 0
+
+        def walk(path: str, sub_own: Optional[dict[str, int]]) -> int:
+            nonlocal walked
+            size = int(_dir_size_mb(
+                Path(path), self.config.one_file_system, stats, self.config.inode_order, self.fs, sub_own, tuner,
+                dirs,
+            ) * 1024 * 1024)
+            walked += size
+            return size
+
+        total = record_size(str(venv), walk, self.fs, own, dirs)
+        if total is None:
+            own.clear()
+            return None
+        if stats is not None:
+            stats.add_dir(0, total - walked)
+        return total / (1024 * 1024)
+
+    def _process_dir(
+        self,
+        found: Path,
+        ecosystem: str,
+        dry_run: bool,
+        stats: Optional[ScanStats] = None,
+        in_use: Optional[InUseIndex] = None,
+    ) -> Optional[CleanResult]:
+        config = self.config
+        hours = _unused_hours(found, self.fs)
+        if hours < self._threshold(found, stats):
+            return None
+        size, own = self._size_mb(found, stats)
+        result = CleanResult(
+            path=str(found),
+            name=found.name,
+            size_mb=round(size, 1),
+            unused_hours=hours,
+            deleted=False,
+            is_file=False,
+            ecosystem=ecosystem,
+        )
+        if in_use is not None and in_use.holder(result.path):
+            result.skipped = "in_use"
+        elif not dry_run:
+            started = time.perf_counter()
+            try:
+                result.archive = _delete_target(found, False, hours, config, self.fs)
+                result.deleted = True
+            except Exception as e:
+                result.error = str(e)
+            if stats is not None:
+                stats.add_phase("delete", time.perf_counter() - started)
+        if stats is not None and not result.deleted:
+            stats.usage.add(result.path, own)
+        return result
+
+    def _process_file(
+        self,
+        found: Path,
+        dry_run: bool,
+        in_use: Optional[InUseIndex] = None,
+        stats: Optional[ScanStats] = None,
+        ecosystem: str = "files",
+    ) -> Optional[CleanResult]:
+        hours = _unused_hours(found, self.fs)
+        if hours < self.config.unused_hours:
+            return None
+        try:
+            size_bytes = self.fs.stat(str(found)).st_size
+        except OSError:
+            size_bytes = 0
+        size = size_bytes / (1024 * 1024)
+        result = CleanResult(
+            path=str(found),
+            name=found.name,
+            size_mb=round(size, 4) if size < 0.01 else round(size, 2),
+            unused_hours=hours,
+            deleted=False,
+            is_file=True,
+            ecosystem=ecosystem,
+        )
+        if in_use is not None and in_use.holder(result.path):
+            result.skipped = "in_use"
+        elif not dry_run:
+            started = time.perf_counter()
+            try:
+                _delete_target(found, True, hours, fs=self.fs)
+                result.deleted = True
+            except Exception as e:
+                result.error = str(e)
+            if stats is not None:
+                stats.add_phase("delete", time.perf_counter() - started)
+        if stats is not None and not result.deleted:
+            stats.usage.add_file(result.path, size_bytes)
+        return result
 
+    def find_candidates(self) -> list[tuple[Path, str]]:
+        """All confirmed dependency folders under the scan roots, ignoring unused_hours, with their ecosystem."""
+        config = self.config
+        found: list[tuple[Path, str]] = []
+        no_files = FileMatcher([])
+        with DeviceScheduler(config.workers_per_device, _device_limits(config, self.fs)) as scheduler:
+            roots, _ = normalize_roots(config.scan_dirs, config.one_file_system, self.fs)
+            for root, dev in roots:
+                scheduler.submit(dev, None, self._visit_dir, root, dev, no_files)
+            for _, future in scheduler.results():
+                visit: _DirVisit = future.result()
+                found.extend(visit.dirs)
+                for sub_path, sub_dev in visit.subdirs:
+                    scheduler.submit(sub_dev, None, self._visit_dir, sub_path, sub_dev, no_files)
+        found.sort()
+        return found
+
+    def _threshold(self, found: Path, stats: Optional[ScanStats]) -> int:
+        """
+        unused_hours for a target folder, raised in projects whose targets were
+        reinstalled soon after deletion; records found's own regrowth first.
+        """
+        log = self._regrowth
+        if log is None or not self.config.regrowth_aware:
+            return self.config.unused_hours
+        event = detect(found, self.fs)
+        if event is not None and log.record(event) and stats is not None:
+            stats.add_regrowth(event)
+        return log.threshold(str(found.parent), self.config.unused_hours)
+
+    def _yield_index(self) -> YieldIndex:
+        if self._yields is None:
+            self._yields = YieldIndex.from_runs(RunSummary.load_all())
+        return self._yields
+
+    def scan(
+        self,
+        dry_run: bool = True,
+        progress_cb=None,
+        stats: Optional[ScanStats] = None,
+        deadline: Optional[float] = None,
+        goal_mb: Optional[float] = None,
+        device_goals_mb: Optional[dict[int, float]] = None,
+    ) -> RunSummary:
+        """
+        Walk the scan roots and collect (and unless dry_run, delete) stale targets.
+        progress_cb(result) is called for each result; for walk-level progress pass
+        a ScanStats and sample it from another thread. Destructive scans hold the
+        run lock, so they wait for any other destructive run to finish.
+
+        Directories are visited in order of how much space past runs found under
+        them, and found targets are handled before walking further. With a deadline
+        (seconds, default config.scan_time_budget) or goal_mb (MB found, or freed
+        unless dry_run), the walk stops early and the summary is marked partial;
+        a complete walk returns the same results in any order. device_goals_mb
+        does the same per device (st_dev of the scan root -> MB): the roots of a
+        device stop being walked once that device's goal is met.
+        """
+        config = self.config
+        stats = stats if stats is not None else ScanStats()
+        in_use = _in_use_index(config)
+        yields = self._yield_index()
+        if config.regrowth_aware and self._regrowth is None:
+            self._regrowth = RegrowthLog.load()
+        deadline = deadline if deadline is not None else (config.scan_time_budget or None)
+        stop_at = time.monotonic() + deadline if deadline else None
+        results: list[CleanResult] = []
+        total_freed = 0.0
+        reclaimable = 0.0
+        stopped = False
+        # Per-device goals: MB found so far and devices whose goal is met.
+        found_by_dev: dict[int, float] = {}
+        done_devs: set[int] = set()
+        root_dev: dict[str, int] = {}
+        # Min-heap of the top_k largest stale files: (size, path, dev, root).
+        largest: list[tuple[int, str, int, str]] = []
+        large_min, top_k = _large_files_settings(config)
+        limits = _device_limits(config, self.fs)
+        tuners = self._tuners = TunerSet("scan", config.workers_per_device, limits) if config.autotune else None
+
+        with nullcontext() if dry_run else run_lock(), DeviceScheduler(config.workers_per_device, limits, tuners) as scheduler:
+
+            def walk(path: str, dev: int, root: str) -> None:
+                if tuners is not None:
+                    tuners.for_device(dev, path)
+                if not stopped and root_dev.get(root) not in done_devs:
+                    scheduler.submit(
+                        dev, ("dir", root), self._visit_dir, path, dev, self.matcher, stats, large_min,
+                        priority=-yields.score(path),
+                    )
+
+            roots, _ = normalize_roots(config.scan_dirs, config.one_file_system, self.fs)
+            stats.usage.roots = [root for root, _ in roots]
+            root_dev.update(roots)
+            for root, dev in roots:
+                walk(root, dev, root)
+
+            def collect(root: str, result: Optional[CleanResult]) -> None:
+                nonlocal total_freed, reclaimable
+                if result is None:
+                    return
+                result.root = root
+                stats.found += 1
+                if result.deleted:
+                    total_freed += result.size_mb
+                if result.deleted or (dry_run and not result.skipped):
+                    reclaimable += result.size_mb
+                    dev = root_dev[root]
+                    found_by_dev[dev] = found_by_dev.get(dev, 0.0) + result.size_mb
                 results.append(result)
                 if progress_cb:
                     progress_cb(result)
 
-    # Files (target_files: .DS_Store, *.log, etc.)
-    for scan_dir in config.scan_dirs:
-        scan_path = Path(scan_dir).expanduser()
-        if not scan_path.is_dir():
-            continue
-        file_patterns = getattr(config, "target_files", None) or []
-        for pattern in file_patterns:
-            try:
-                for found in scan_path.rglob(pattern):
-                    if not found.is_file():
-                        continue
-                    hours = _unused_hours(found)
-                    if hours < config.unused_hours:
-                        continue
-                    try:
-                        size = found.stat().st_size / (1024 * 1024)
-                    except OSError:
-                        size = 0.0
-                    result = CleanResult(
-                        path=str(found),
-                        name=found.name,
-                        size_mb=round(size, 4) if size < 0.01 else round(size, 2),
-                        unused_hours=hours,
-                        deleted=False,
-                        is_file=True,
-                    )
-                    if not dry_run:
-                        try:
-                            found.unlink()
-                            result.deleted = True
-                            total_freed += size
-                        except Exception as e:
-                            result.error = str(e)
-                    results.append(result)
-                    if progress_cb:
-                        progress_cb(result)
-            except PermissionError:
-                continue
+            for (kind, root), future in scheduler.results():
+                if kind == "dir":
+                    stats.current_root = root
+                    stats.dirs_by_root[root] = stats.dirs_by_root.get(root, 0) + 1
+                    visit: _DirVisit = future.result()
+                    for size, large_path in visit.large:
+                        item = (size, large_path, visit.dev, root)
+                        if len(largest) < top_k:
+                            heapq.heappush(largest, item)
+                        elif item > largest[0]:
+                            heapq.heapreplace(largest, item)
+                    for sub_path, sub_dev in visit.subdirs:
+                        walk(sub_path, sub_dev, root)
+                    for found, ecosystem in visit.dirs:
+                        scheduler.submit(
+                            visit.dev, ("result", root), self._process_dir, found, ecosystem, dry_run, stats, in_use,
+                            priority=_RESULTS_FIRST,
+                        )
+                    for found in visit.files:
+                        scheduler.submit(
+                            visit.dev, ("result", root), self._process_file, found, dry_run, in_use, stats,
+                            priority=_RESULTS_FIRST,
+                        )
+                else:
+                    collect(root, future.result())
+                if not stopped and (
+                    (stop_at is not None and time.monotonic() >= stop_at)
+                    or (goal_mb and reclaimable >= goal_mb)
+                ):
+                    # Finish targets already found; just stop walking.
+                    stopped = True
+                    scheduler.discard(lambda tag: tag[0] == "dir")
+                for dev, goal in (device_goals_mb or {}).items():
+                    if dev not in done_devs and found_by_dev.get(dev, 0.0) >= goal:
+                        done_devs.add(dev)
+                        scheduler.discard(lambda tag, dev=dev: tag[0] == "dir" and root_dev.get(tag[1]) == dev)
 
-    summary = RunSummary(
-        timestamp=time.strftime("%Y-%m-%d %H:%M:%S"),
-        results=[asdict(r) for r in results],
-        total_freed_mb=round(total_freed, 1),
-        dry_run=dry_run,
-    )
-    summary.save()
+            # The largest files are only known once the walk is over.
+            for _, large_path, dev, root in largest:
+                scheduler.submit(
+                    dev, ("result", root), self._process_file, Path(large_path), dry_run, in_use, stats, "large_files"
+                )
+            for (_, root), future in scheduler.results():
+                collect(root, future.result())
+
+        if tuners is not None:
+            tuners.save()
+            self._tuners = None
+        results.sort(key=lambda r: (r.is_file, r.path))
+        summary = RunSummary(
+            timestamp=time.strftime("%Y-%m-%d %H:%M:%S"),
+            results=[asdict(r) for r in results],
+            total_freed_mb=round(total_freed, 1),
+            dry_run=dry_run,
+            partial=stopped or bool(done_devs),
+        )
+        stats.usage.timestamp = summary.timestamp
+        stats.usage.partial = summary.partial
+        for sink in self.sinks:
+            sink(summary, stats)
+        return summary
+
+
+def find_candidates(config: Config) -> list[tuple[Path, str]]:
+    """All confirmed dependency folders under the scan roots, ignoring unused_hours, with their ecosystem."""
+    return Scanner(config).find_candidates()
+
+
+def scan(
+    config: Config,
+    dry_run: bool = True,
+    progress_cb=None,
+    stats: Optional[ScanStats] = None,
+    deadline: Optional[float] = None,
+    goal_mb: Optional[float] = None,
+) -> RunSummary:
+    """One-shot scan that records the run in history and the log (see Scanner for library use)."""
+    return Scanner(config, sinks=default_sinks(config)).scan(dry_run, progress_cb, stats, deadline, goal_mb)
 
-    _write_log(summary)
-    return summary
+
+@dataclass
+class ResultGroup:
+    """Results of one ecosystem under one project root."""
+    project: str
+    ecosystem: str
+    results: list[dict] = field(default_factory=list)
+    size_mb: float = 0.0
+
+
+def group_results(results: list[dict]) -> list[ResultGroup]:
+    """
+    Aggregate results by (project root, ecosystem), largest groups first.
+    A folder's project is its parent; a file belongs to the closest ancestor that
+    is the project of some folder result, or else to its scan root.
+    """
+    projects = {str(Path(r["path"]).parent) for r in results if not r.get("is_file")}
+    groups: dict[tuple[str, str], ResultGroup] = {}
+    for r in results:
+        path = Path(r["path"])
+        if r.get("is_file"):
+            root = r.get("root") or str(path.parent)
+            project = root
+            for parent in path.parents:
+                candidate = str(parent)
+                if candidate in projects:
+                    project = candidate
+                    break
+                if candidate == root or len(candidate) < len(root):
+                    break
+            ecosystem = r.get("ecosystem") or "files"
+        else:
+            project = str(path.parent)
+            ecosystem = r.get("ecosystem") or r["name"]
+        group = groups.get((project, ecosystem))
+        if group is None:
+            group = groups[(project, ecosystem)] = ResultGroup(project, ecosystem)
+        group.results.append(r)
+        group.size_mb += r.get("size_mb", 0) or 0
+    return sorted(groups.values(), key=lambda g: (-g.size_mb, g.project, g.ecosystem))
 
 
 def _write_log(summary: RunSummary) -> None:
@@ -313,44 +957,286 @@ def _write_log(summary: RunSummary) -> None:
         f"[{summary.timestamp}] {mode} — {len(summary.results)} found, {summary.total_freed_mb}MB freed"
     ]
     for r in summary.results:
-        status = "DELETED" if r["deleted"] else ("ERROR" if r.get("error") else "SIMULATED")
+        if r.get("archive"):
+            status = "ARCHIVED"
+        elif r["deleted"]:
+            status = "DELETED"
+        elif r.get("error"):
+            status = "ERROR"
+        elif r.get("skipped"):
+            status = f"SKIPPED:{r['skipped']}"
+        else:
+            status = "SIMULATED"
         lines.append(f"  [{status}] {r['path']} ({r['size_mb']}MB, {r['unused_hours']}h unused)")
     lines.append("")
     with open(LOG_PATH, "a", encoding="utf-8") as f:
         f.write("\n".join(lines) + "\n")
 
 
-def delete_from_summary(summary: RunSummary, progress_cb=None) -> float:
-    """Delete folders and files listed in a summary. Return MB freed."""
+def delete_from_summary(
+    summary: RunSummary, progress_cb=None, config: Optional[Config] = None, fs: FileSystem = LOCAL  # noqa: ANN001
+) -> float:
+    """
+    Delete (or archive, per config.action) folders and files listed in a summary.
+    Each result dict gets "deleted" (and "error"/"archive"/"skipped") updated. Return MB freed.
+    """
+    started = time.perf_counter()
+    with run_lock():
+        freed = _delete_listed(summary, progress_cb, config, fs)
+    forget_deleted(summary.results)
+    if config is not None and config.metrics_file:
+        write_textfile(
+            Path(config.metrics_file), summary.results, "clean", {"delete": time.perf_counter() - started}
+        )
+    return freed
+
+
+def _delete_listed(
+    summary: RunSummary, progress_cb, config: Optional[Config], fs: FileSystem  # noqa: ANN001
+) -> float:
     total_freed = 0.0
     results = summary.results
+    seen: set[str] = set()
+    in_use = _in_use_index(config)
     for i, r in enumerate(results):
         path = Path(r["path"])
-        if not path.exists():
+        if r["path"] in seen or not fs.exists(r["path"]):
+            if progress_cb:
+                progress_cb(i + 1, len(results), r, None)
+            continue
+        seen.add(r["path"])
+        # Fresh snapshot: a target in use at scan time may be free now, and vice versa.
+        r["skipped"] = "in_use" if in_use.holder(r["path"]) else None
+        if r["skipped"]:
             if progress_cb:
                 progress_cb(i + 1, len(results), r, None)
             continue
-        is_file = r.get("is_file", False)
         try:
             size_mb = r.get("size_mb", 0) or 0
-            if is_file:
-                path.unlink()
-            else:
-                shutil.rmtree(path)
-                marker = path.parent / "install_packages_again"
-                marker.write_text(
-                    f"Folder '{path.name}' removed by Simple Dev Cleaner "
-                    f"(unused for {r.get('unused_hours', 0)}h). Reinstall dependencies.\n"
-                )
+            archive = _delete_target(path, r.get("is_file", False), r.get("unused_hours", 0), config, fs)
+            if archive:
+                r["archive"] = archive
+            r["deleted"] = True
             total_freed += size_mb
             if progress_cb:
                 progress_cb(i + 1, len(results), r, None)
         except Exception as e:
+            r["error"] = str(e)
             if progress_cb:
                 progress_cb(i + 1, len(results), r, str(e))
     return round(total_freed, 1)
 
 
+class DeletePipeline:
+    """
+    Delete scan results that match auto-delete rules on a worker pool while the
+    walk goes on, so a clean takes about max(scan, delete) instead of their sum.
+    Pass offer as (part of) the scan's progress_cb, then close() after the scan.
+    The caller must hold the run lock. With config.autotune, deletions run
+    concurrently up to a tuned limit per device instead of delete_workers.
+    """
+
+    def __init__(
+        self, config: Config, rules: Optional[list[DeleteRule]] = None, fs: FileSystem = LOCAL
+    ) -> None:
+        self.config = config
+        self.fs = fs
+        self.rules = rules if rules is not None else parse_rules(config.auto_delete_rules)
+        self._tuners = TunerSet("delete", config.delete_workers) if config.autotune else None
+        workers = MAX_WORKERS if self._tuners is not None else max(1, config.delete_workers)
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix="sdc-delete")
+        self._lock = threading.Lock()
+        # Per-device slots when tuning: running and waiting deletions.
+        self._slots = threading.Condition(self._lock)
+        self._running: dict[int, int] = {}
+        self._waiting: dict[int, int] = {}
+        self._in_use = _in_use_index(config)
+        self.results: list[CleanResult] = []
+        self.queued = 0
+        self.done = 0
+        self.freed_mb = 0.0
+        self.errors = 0
+        self.started = time.monotonic()
+
+    def offer(self, result: CleanResult) -> bool:
+        """Queue result for deletion if a rule confirms it. Return whether it was queued."""
+        if result.skipped or result.deleted or not any(rule.matches(result) for rule in self.rules):
+            return False
+        if self._in_use.holder(result.path):
+            result.skipped = "in_use"
+            return False
+        with self._lock:
+            self.queued += 1
+            self.results.append(result)
+        self._pool.submit(self._delete, result)
+        return True
+
+    def _acquire(self, result: CleanResult) -> tuple[Optional[int], Optional[Tuner]]:
+        """Wait for a slot on the result's device; (dev, tuner) to release, or (None, None) untuned."""
+        dev = device_of(result.path, self.fs) if self._tuners is not None else None
+        if dev is None:
+            return None, None
+        tuner = self._tuners.for_device(dev, result.path)
+        with self._slots:
+            self._waiting[dev] = self._waiting.get(dev, 0) + 1
+            while self._running.get(dev, 0) >= tuner.limit:
+                self._slots.wait(0.1)
+            self._waiting[dev] -= 1
+            self._running[dev] = self._running.get(dev, 0) + 1
+        return dev, tuner
+
+    def _release(self, dev: Optional[int], tuner: Optional[Tuner]) -> None:
+        if dev is None or tuner is None:
+            return
+        with self._slots:
+            self._running[dev] -= 1
+            if not self._waiting.get(dev) and self._running[dev] < tuner.limit:
+                tuner.starved()
+            self._slots.notify_all()
+
+    def _delete(self, result: CleanResult) -> None:
+        dev, tuner = self._acquire(result)
+        try:
+            result.archive = _delete_target(
+                Path(result.path), result.is_file, result.unused_hours, self.config, self.fs, tuner
+            )
+            result.deleted = True
+        except Exception as e:
+            result.error = str(e)
+        finally:
+            self._release(dev, tuner)
+        with self._lock:
+            self.done += 1
+            if result.deleted:
+                self.freed_mb += result.size_mb
+            else:
+                self.errors += 1
+
+    def close(self, scan_summary: Optional[RunSummary] = None, scan_stats: Optional[ScanStats] = None) -> RunSummary:
+        """
+        Wait for queued deletions; record them in history and the log; return their summary.
+        Pass the summary and stats of the dry-run scan the pipeline rode along (run
+        without sinks): its results minus the ones deleted here are recorded as their
+        own entry, and one metrics textfile covers both.
+        """
+        self._pool.shutdown(wait=True)
+        if self._tuners is not None:
+            self._tuners.save()
+        self.results.sort(key=lambda r: (r.is_file, r.path))
+        summary = RunSummary(
+            timestamp=time.strftime("%Y-%m-%d %H:%M:%S"),
+            results=[asdict(r) for r in self.results],
+            total_freed_mb=round(self.freed_mb, 1),
+            dry_run=False,
+        )
+        stats = ScanStats()
+        stats.started = self.started
+        if scan_summary is None:
+            for sink in default_sinks(self.config):
+                sink(summary, stats)
+            return summary
+
+        # Targets whose deletion failed stay in the dry-run entry, to be picked again in the review.
+        handled = {r.path for r in self.results if r.deleted}
+        scan_summary.results = [r for r in scan_summary.results if r["path"] not in handled]
+        scan_stats = scan_stats if scan_stats is not None else ScanStats()
+        for sink in default_sinks(self.config, metrics=False):
+            sink(scan_summary, scan_stats)
+        for sink in default_sinks(self.config, metrics=False):
+            sink(summary, stats)
+        if self.config.metrics_file:
+            offered = {r.path for r in self.results}
+            merged = RunSummary(
+                timestamp=summary.timestamp,
+                # Failed deletions are counted once, with their error.
+                results=[r for r in scan_summary.results if r["path"] not in offered] + summary.results,
+                total_freed_mb=summary.total_freed_mb,
+                dry_run=not handled,
+            )
+            metrics_sink(self.config.metrics_file)(merged, scan_stats)
+        return summary
+
+
+# ── Scheduled runs ──────────────────────────────────────────────────────────
+
+def _free_pct(path: str) -> float:
+    usage = shutil.disk_usage(path)
+    return usage.free / usage.total * 100 if usage.total else 100.0
+
+
+def _missing_mb(path: str, target_pct: float) -> float:
+    """MB to free on path's filesystem to get to target_pct % free."""
+    usage = shutil.disk_usage(path)
+    return max(0.0, usage.total * target_pct / 100 - usage.free) / (1024 * 1024)
+
+
+def run_scheduled(config: Config) -> Optional[RunSummary]:
+    """
+    Entry point of the LaunchAgent run. Without a watermark this is a full
+    destructive scan. With one, free space is checked first on each scan root's
+    filesystem: if all are above watermark_high_pct nothing is walked (return None);
+    otherwise only the roots on low filesystems are scanned, and targets are deleted
+    stalest first until each filesystem reaches watermark_target_pct.
+    Configured cache_caps are then enforced on the global package caches (not
+    when the watermark check skipped the run). If another destructive run holds the lock, do nothing (return None). While
+    running, results are published on the live socket for `sdevclean` to attach.
+    """
+    try:
+        with run_lock(blocking=False), LiveFeed() as feed:
+            summary = _run_scheduled(config, feed)
+            feed.close(summary)
+            if summary is not None and config.cache_caps:
+                write_cache_log(cap_caches(config.cache_caps, dry_run=False))
+            return summary
+    except LockBusy:
+        return None
+
+
+def _run_scheduled(config: Config, feed: LiveFeed) -> Optional[RunSummary]:
+    high = config.watermark_high_pct
+    if high <= 0:
+        return scan(config, dry_run=False, progress_cb=feed.publish)
+    target = max(config.watermark_target_pct, high)
+    roots, _ = normalize_roots(config.scan_dirs, config.one_file_system)
+    probe: dict[int, str] = {}
+    for root, dev in roots:
+        probe.setdefault(dev, root)
+    low = {dev for dev, root in probe.items() if _free_pct(root) < high}
+    if not low:
+        return None
+
+    root_dev = {root: dev for root, dev in roots}
+    low_config = replace(config, scan_dirs=[root for root, dev in roots if dev in low])
+    stats = ScanStats()
+    # Stop walking each filesystem once enough candidates were found on it to reach the target.
+    goals = {dev: _missing_mb(probe[dev], target) for dev in low}
+    planned = Scanner(low_config).scan(dry_run=True, progress_cb=feed.publish, stats=stats, device_goals_mb=goals)
+    results: list[dict] = []
+    total_freed = 0.0
+    for r in sorted(planned.results, key=lambda r: -r["unused_hours"]):
+        dev = root_dev.get(r.get("root", ""))
+        if r.get("skipped") or dev is None or _free_pct(probe[dev]) >= target:
+            continue
+        try:
+            r["archive"] = _delete_target(Path(r["path"]), r.get("is_file", False), r["unused_hours"], config)
+            r["deleted"] = True
+            total_freed += r.get("size_mb", 0) or 0
+        except Exception as e:
+            r["error"] = str(e)
+        results.append(r)
+
+    summary = RunSummary(
+        timestamp=time.strftime("%Y-%m-%d %H:%M:%S"),
+        results=results,
+        total_freed_mb=round(total_freed, 1),
+        dry_run=False,
+        partial=planned.partial,
+    )
+    for sink in default_sinks(config):
+        sink(summary, stats)
+    return summary
+
+
 # ── LaunchAgent (macOS) ─────────────────────────────────────────────────────
 
 def install_agent(config: Config) -> bool:
@@ -410,10 +1296,10 @@ def is_agent_installed() -> bool:
 def _ensure_run_script(path: Path) -> None:
     script = '''#!/usr/bin/env python3
 """Auto-run script invoked by LaunchAgent."""
-from simple_dev_cleaner.cleaner import Config, scan
+from simple_dev_cleaner.cleaner import Config, run_scheduled
 
 config = Config.load()
-scan(config, dry_run=False)
+run_scheduled(config)
 '''
     path.write_text(script, encoding="utf-8")
     os.chmod(path, 0o755)
@@ -3,10 +3,12 @@
 Simple Dev Cleaner — Interactive menu with polished UI.
 """
 
+import argparse
 import os
 import shlex
 import subprocess
 import sys
+import tarfile
 import time
 from datetime import datetime
 from pathlib import Path
@@ -23,23 +25,44 @@ from rich.progress import (
     TextColumn,
     TaskProgressColumn,
 )
+from rich.live import Live
 from rich.prompt import Prompt, Confirm
+from rich.spinner import Spinner
 from rich.columns import Columns
 from rich.text import Text
 from rich import box
 
+from simple_dev_cleaner.archive import ArchiveError, restore
+from simple_dev_cleaner.caches import KNOWN_CACHES, cap_caches, write_cache_log
 from simple_dev_cleaner.cleaner import (
     Config,
+    DeletePipeline,
+    ResultGroup,
     RunSummary,
+    Scanner,
+    archive_dir,
+    group_results,
     scan,
     delete_from_summary,
 )
+from simple_dev_cleaner.dedupe import dedupe
+from simple_dev_cleaner.detectors import registered_names, unknown_names
+from simple_dev_cleaner.lock import LIVE_SOCKET, LiveFeed, LockBusy, attach, run_lock
+from simple_dev_cleaner.multiuser import MIN_UID, run_system
+from simple_dev_cleaner.plan import apply_plan, load_plan, write_plan
+from simple_dev_cleaner.regrowth import CHURN_HOURS, Regrowth, RegrowthLog
+from simple_dev_cleaner.rules import DeleteRule, parse_rules
+from simple_dev_cleaner.usage import SizeIndex
+from simple_dev_cleaner.walker import ScanStats, normalize_roots
 from simple_dev_cleaner.system_info import get_system_info
 from simple_dev_cleaner.update_check import run_update
 from simple_dev_cleaner import __version__
 
 console = Console()
 
+# How often the scan progress line samples ScanStats.
+SCAN_REFRESH_HZ = 8
+
 LOGO = r"""[bold cyan]
    _____ ____              ______ __
   / ___// __ \___ _   __ / ____// /__  ____ _____  ___  _____
@@ -52,6 +75,7 @@ MENU_ICONS = {
     "1": "🧹",
     "2": "📋",
     "3": "⚙️ ",
+    "4": "📊",
     "0": "👋",
 }
 
@@ -74,6 +98,7 @@ TEXTS = {
         "menu_3": "Ver información del sistema",
         "menu_4": "Historial de limpiezas",
         "menu_5": "Configuración",
+        "menu_6": "Explorar espacio",
         "menu_0": "Salir",
         "prompt_option": "",
         "hint_exit": "[dim](0 o q = salir)[/]",
@@ -87,6 +112,7 @@ TEXTS = {
         "done": "Listo",
         "total_found": "Total encontrados",
         "none_match": "No hay carpetas que cumplan el criterio (sin uso hace al menos {} horas).",
+        "unknown_targets": "[yellow]Estas carpetas de target_names no las reconoce ningún ecosistema y no se buscan: {}. Disponibles: {}.[/]",
         "table_would_delete": "Se borrarían al confirmar",
         "col_path": "Ruta",
         "col_type": "Tipo",
@@ -133,6 +159,12 @@ TEXTS = {
         "history_empty": "[dim]Todavía no hay historial. Cuando hagas una limpieza, acá va a aparecer.[/]",
         "history_total_freed": "Total liberado",
         "history_runs": "ejecuciones",
+        "churn_title": "Reinstalaciones",
+        "churn_caption": "{} carpetas borradas se reinstalaron en menos de {} ({} de nuevo). Esos proyectos esperan más antes del próximo borrado.",
+        "col_project": "Proyecto",
+        "col_regrowths": "Veces",
+        "col_regrown_after": "Volvió a los",
+        "col_threshold": "Umbral",
         "col_date": "Fecha",
         "col_type_run": "Tipo",
         "col_items": "Items",
@@ -152,6 +184,7 @@ TEXTS = {
         "folders_list": "Carpetas que se escanean",
         "exists": "existe",
         "not_exists": "no existe (no se escaneará)",
+        "redundant_root": "redundante: ya la cubre {}",
         "path_prompt": "Ruta(s). Una o varias separadas por coma. [dim]q = cancelar[/]",
         "path_empty": "No escribiste ninguna ruta. Probá de nuevo.",
         "path_not_found": "No encontré esa carpeta. Revisá que la ruta exista y que tengas permisos de lectura.",
@@ -185,6 +218,68 @@ TEXTS = {
         "updated": "[green]✅ Actualizado[/]",
         "update_fail": "No se pudo actualizar. Actualizá manualmente: [dim]pipx upgrade simple-dev-cleaner[/]",
         "up_to_date": "[dim]✓ Al día[/]",
+        "plan_written": "✅ Plan guardado en [bold]{}[/]: {} items, {}.",
+        "plan_invalid": "No se pudo leer el plan",
+        "applying": "Aplicando plan...",
+        "plan_applied": "Plan aplicado",
+        "plan_skipped": "{} omitidos (cambiaron, ya no existen o están en uso desde que se hizo el plan).",
+        "pipeline_ask": "Reglas de borrado automático: {}. ¿Borrar lo que coincida mientras se escanea? (el resto lo revisás después)",
+        "pipeline_no": "❌ No, sólo escanear",
+        "pipeline_yes": "🗑  Sí, borrar mientras escanea",
+        "pipeline_discovery": "Descubrimiento",
+        "pipeline_sizing": "Tamaño",
+        "pipeline_deleting": "Borrado",
+        "pipeline_done": "Borrados automáticamente: [bold]{}[/] ({}).",
+        "pipeline_errors": "{} no se pudieron borrar (ver el log).",
+        "scan_partial": "El escaneo se cortó al llegar al límite de tiempo (scan_time_budget); se recorrieron primero las carpetas donde más se encontró antes.",
+        "in_use_note": "{} en uso por un proceso en ejecución (cwd, ejecutable o archivo abierto); no se van a borrar.",
+        "dedupe_scanning": "Buscando archivos duplicados...",
+        "dedupe_title": "Deduplicación con hardlinks",
+        "dedupe_summary": "{} carpetas, {} archivos revisados, {} grupos idénticos, {} duplicados.",
+        "dedupe_reclaimable": "Espacio recuperable",
+        "dedupe_reclaimed": "Espacio recuperado",
+        "dedupe_linked": "Archivos reemplazados por hardlinks",
+        "dedupe_hint": "[dim]Ejecutá [bold]sdevclean dedupe --apply[/bold] para crear los hardlinks.[/]",
+        "caches_scanning": "Midiendo cachés globales...",
+        "caches_title": "Cachés globales (se borra lo usado hace más tiempo hasta entrar en el límite)",
+        "caches_none": "No hay límites configurados. Agregá por ejemplo [bold]cache_caps = {{ npm = 2048, pip = 1024 }}[/] en config.toml (cachés: {}).",
+        "caches_missing": "Ninguna de las cachés configuradas existe en esta máquina.",
+        "col_cache": "Caché",
+        "col_cap": "Límite",
+        "col_evict": "A liberar",
+        "col_evicted": "Liberado",
+        "caches_hint": "[dim]Ejecutá [bold]sdevclean caches --apply[/bold] para liberar el espacio.[/]",
+        "system_root": "El modo sistema tiene que ejecutarse como root.",
+        "system_scanning": "Limpiando las carpetas de cada usuario...",
+        "system_mode_title": "Modo sistema (cada usuario con su config y sus permisos)",
+        "system_none": "No se encontraron usuarios con carpeta personal.",
+        "system_hint": "[dim]Ejecutá [bold]sudo sdevclean system --apply[/bold] para borrar.[/]",
+        "col_user": "Usuario",
+        "col_found": "Encontrado",
+        "col_status": "Estado",
+        "explore_empty": "[dim]Todavía no hay tamaños guardados. Hacé un escaneo y volvé acá.[/]",
+        "explore_title": "Dónde está el espacio (escaneo del {})",
+        "explore_partial": "[dim]El último escaneo se cortó antes de terminar: puede faltar algo.[/]",
+        "explore_other": "(archivos y carpetas chicas)",
+        "explore_help": "[dim]número = abrir • .. = subir • Enter / q = volver al menú[/]",
+        "col_share": "Parte",
+        "warning_archive": "📦 Las carpetas se comprimen en {} y se pueden recuperar con [bold]sdevclean restore <carpeta>[/].",
+        "archive_note": "[dim]Junto a cada carpeta archivada quedó un archivo [bold]*.sdevclean-archive.toml[/bold] que apunta a su archivo comprimido.[/]",
+        "restored": "✅ Restaurada: [bold]{}[/]",
+        "restore_fail": "No se pudo restaurar",
+        "walk_dirs": "carpetas",
+        "walk_rate": "entradas/s",
+        "walk_sized": "medido",
+        "col_ecosystem": "Ecosistema",
+        "browse_status": "  Página {}/{} • {} grupos visibles • {} seleccionados ({})",
+        "browse_help": "[dim]n/p = página • /texto = filtrar • 3, 2-5 = marcar/desmarcar • a = todos • x = ninguno • Enter = continuar • q = cancelar[/]",
+        "nothing_selected": "No hay nada seleccionado. No se borra nada.",
+        "instance_busy": "Otra ejecución de sdevclean está escaneando en este momento.",
+        "attach_ask": "¿Qué querés hacer?",
+        "attach_yes": "👀 Ver sus resultados en vivo",
+        "attach_no": "🔍 Escanear por mi cuenta igual",
+        "attach_failed": "No se pudo conectar con la otra ejecución; se escanea por separado.",
+        "attach_done": "La otra ejecución terminó: {} resultados ({}).",
     },
     "en": {
         "app_subtitle": "Dependency cleaner",
@@ -194,6 +289,7 @@ TEXTS = {
         "menu_3": "System information",
         "menu_4": "Cleanup history",
         "menu_5": "Settings",
+        "menu_6": "Explore disk usage",
         "menu_0": "Exit",
         "prompt_option": "",
         "hint_exit": "[dim](0 or q = exit)[/]",
@@ -207,6 +303,7 @@ TEXTS = {
         "done": "Done",
         "total_found": "Total found",
         "none_match": "No folders match the criteria (unused for at least {} hours).",
+        "unknown_targets": "[yellow]No ecosystem recognizes these target_names, so they are not scanned: {}. Available: {}.[/]",
         "table_would_delete": "Would be deleted on confirm",
         "col_path": "Path",
         "col_type": "Type",
@@ -253,6 +350,12 @@ TEXTS = {
         "history_empty": "[dim]No history yet. After a cleanup, it will show here.[/]",
         "history_total_freed": "Total freed",
         "history_runs": "runs",
+        "churn_title": "Reinstalls",
+        "churn_caption": "{} deleted folders were reinstalled within {} ({} again). Those projects now wait longer before the next deletion.",
+        "col_project": "Project",
+        "col_regrowths": "Times",
+        "col_regrown_after": "Back after",
+        "col_threshold": "Threshold",
         "col_date": "Date",
         "col_type_run": "Type",
         "col_items": "Items",
@@ -272,6 +375,7 @@ TEXTS = {
         "folders_list": "Folders being scanned",
         "exists": "exists",
         "not_exists": "does not exist (will be skipped)",
+        "redundant_root": "redundant: already covered by {}",
         "path_prompt": "Path(s). One or more, comma-separated. [dim]q = cancel[/]",
         "path_empty": "You didn't enter a path. Try again.",
         "path_not_found": "That folder wasn't found. Check that the path exists and you have read permission.",
@@ -305,6 +409,68 @@ TEXTS = {
         "updated": "[green]✅ Updated[/]",
         "update_fail": "Could not update. Update manually: [dim]pipx upgrade simple-dev-cleaner[/]",
         "up_to_date": "[dim]✓ Up to date[/]",
+        "plan_written": "✅ Plan saved to [bold]{}[/]: {} items, {}.",
+        "plan_invalid": "Could not read the plan",
+        "applying": "Applying plan...",
+        "plan_applied": "Plan applied",
+        "plan_skipped": "{} skipped (changed, gone or in use since the plan was made).",
+        "pipeline_ask": "Auto-delete rules: {}. Delete matching items while scanning? (you review the rest afterwards)",
+        "pipeline_no": "❌ No, just scan",
+        "pipeline_yes": "🗑  Yes, delete while scanning",
+        "pipeline_discovery": "Discovery",
+        "pipeline_sizing": "Sizing",
+        "pipeline_deleting": "Deleting",
+        "pipeline_done": "Deleted automatically: [bold]{}[/] ({}).",
+        "pipeline_errors": "{} could not be deleted (see the log).",
+        "scan_partial": "The scan stopped at its time limit (scan_time_budget); folders where the most was found before were walked first.",
+        "in_use_note": "{} in use by a running process (cwd, executable or open file); they will not be deleted.",
+        "dedupe_scanning": "Looking for duplicate files...",
+        "dedupe_title": "Hardlink dedupe",
+        "dedupe_summary": "{} folders, {} files checked, {} identical groups, {} duplicates.",
+        "caches_scanning": "Measuring global caches...",
+        "caches_title": "Global caches (least recently used entries go first until each fits its cap)",
+        "caches_none": "No caps configured. Add for example [bold]cache_caps = {{ npm = 2048, pip = 1024 }}[/] to config.toml (caches: {}).",
+        "caches_missing": "None of the configured caches exist on this machine.",
+        "col_cache": "Cache",
+        "col_cap": "Cap",
+        "col_evict": "To free",
+        "col_evicted": "Freed",
+        "caches_hint": "[dim]Run [bold]sdevclean caches --apply[/bold] to free the space.[/]",
+        "system_root": "System mode must run as root.",
+        "system_scanning": "Cleaning each user's folders...",
+        "system_mode_title": "System mode (each user with their own config and permissions)",
+        "system_none": "No users with a home directory were found.",
+        "system_hint": "[dim]Run [bold]sudo sdevclean system --apply[/bold] to delete.[/]",
+        "col_user": "User",
+        "col_found": "Found",
+        "col_status": "Status",
+        "explore_empty": "[dim]No sizes saved yet. Run a scan and come back here.[/]",
+        "explore_title": "Where the space is (scan of {})",
+        "explore_partial": "[dim]The last scan stopped before finishing: some space may be missing.[/]",
+        "explore_other": "(files and small folders)",
+        "explore_help": "[dim]number = open • .. = up • Enter / q = back to menu[/]",
+        "col_share": "Share",
+        "dedupe_reclaimable": "Reclaimable space",
+        "dedupe_reclaimed": "Space reclaimed",
+        "dedupe_linked": "Files replaced by hardlinks",
+        "dedupe_hint": "[dim]Run [bold]sdevclean dedupe --apply[/bold] to create the hardlinks.[/]",
+        "warning_archive": "📦 Folders are compressed into {} and can be brought back with [bold]sdevclean restore <folder>[/].",
+        "archive_note": "[dim]Each archived folder left a [bold]*.sdevclean-archive.toml[/bold] file pointing to its archive.[/]",
+        "restored": "✅ Restored: [bold]{}[/]",
+        "restore_fail": "Could not restore",
+        "walk_dirs": "dirs",
+        "walk_rate": "entries/s",
+        "walk_sized": "sized",
+        "col_ecosystem": "Ecosystem",
+        "browse_status": "  Page {}/{} • {} groups shown • {} selected ({})",
+        "browse_help": "[dim]n/p = page • /text = filter • 3, 2-5 = toggle • a = all • x = none • Enter = continue • q = cancel[/]",
+        "nothing_selected": "Nothing selected. Nothing will be deleted.",
+        "instance_busy": "Another sdevclean run is scanning right now.",
+        "attach_ask": "What do you want to do?",
+        "attach_yes": "👀 Watch its results live",
+        "attach_no": "🔍 Scan on my own anyway",
+        "attach_failed": "Could not connect to the other run; scanning separately.",
+        "attach_done": "The other run finished: {} results ({}).",
     },
 }
 
@@ -433,10 +599,11 @@ def print_banner(config: Config) -> None:
 
 
 def main_menu(config: Config) -> str:
-    choices = ["0", "1", "2", "3"]
+    choices = ["0", "1", "2", "3", "4"]
     if sys.stdin.isatty():
         menu_choices = [
             Choice(f"{MENU_ICONS['1']} {t(config, 'menu_1')}", value="1"),
+            Choice(f"{MENU_ICONS['4']} {t(config, 'menu_6')}", value="4"),
             Choice(f"{MENU_ICONS['2']} {t(config, 'menu_4')}", value="2"),
             Choice(f"{MENU_ICONS['3']} {t(config, 'menu_5')}", value="3"),
             Choice(f"{MENU_ICONS['0']} {t(config, 'menu_0')}", value="0"),
@@ -453,6 +620,247 @@ def main_menu(config: Config) -> str:
         return "0"
 
 
+class _ScanProgress:
+    """
+    Walk progress line; Live samples the shared ScanStats at a fixed rate.
+    With a DeletePipeline, discovery, sizing and deletion are shown side by side.
+    """
+
+    def __init__(self, config: Config, stats: ScanStats, pipeline: "DeletePipeline | None" = None) -> None:
+        self.config = config
+        self.stats = stats
+        self.pipeline = pipeline
+        self.spinner = Spinner("dots", style="bold blue")
+
+    def _pipeline_grid(self) -> Table:
+        s, p, config = self.stats, self.pipeline, self.config
+        grid = Table.grid(padding=(0, 3))
+        for key in ("pipeline_discovery", "pipeline_sizing", "pipeline_deleting"):
+            grid.add_column(header=t(config, key))
+        grid.show_header = True
+        grid.header_style = "bold"
+        deleting = f"{p.done}/{p.queued} • {format_size_mb(p.freed_mb)}"
+        if p.errors:
+            deleting += f" • [red]{p.errors} ✗[/]"
+        grid.add_row(
+            f"{t(config, 'walk_dirs')}: {s.dirs_visited} • {s.entries_per_second:,.0f} {t(config, 'walk_rate')}",
+            f"{t(config, 'found_count')}: {s.found} • {format_size_mb(s.bytes_sized / (1024 * 1024))}",
+            deleting,
+        )
+        return grid
+
+    def __rich__(self) -> "Spinner | Table":
+        if self.pipeline is not None:
+            return self._pipeline_grid()
+        s = self.stats
+        root = s.current_root.replace(str(Path.home()), "~")
+        if len(root) > 40:
+            root = "..." + root[-37:]
+        self.spinner.update(text=Text.from_markup(
+            f"[bold blue]{t(self.config, 'scanning')}[/] [dim]"
+            f"{t(self.config, 'found_count')}: {s.found} • "
+            f"{t(self.config, 'walk_dirs')}: {s.dirs_visited} • "
+            f"{s.entries_per_second:,.0f} {t(self.config, 'walk_rate')} • "
+            f"{t(self.config, 'walk_sized')}: {format_size_mb(s.bytes_sized / (1024 * 1024))} • "
+            f"{root}[/]",
+            overflow="ellipsis",
+            end="",
+        ))
+        self.spinner.text.no_wrap = True
+        return self.spinner
+
+
+def _groups_table(
+    config: Config,
+    groups: list[ResultGroup],
+    rows: list[int],
+    first: int,
+    selected: set[int],
+    caption: str,
+) -> Table:
+    """Render only the given rows (indexes into groups); first is the 0-based number of the first row."""
+    table = Table(
+        title=f"  {t(config, 'table_would_delete')}",
+        caption=caption,
+        box=box.SIMPLE_HEAVY,
+        header_style="bold cyan",
+        border_style="blue",
+        show_lines=False,
+        pad_edge=True,
+        row_styles=["", "dim"],
+    )
+    table.add_column("#", style="dim", width=5, justify="right")
+    table.add_column("", width=2)
+    table.add_column(t(config, "col_project"), overflow="fold", ratio=3)
+    table.add_column(t(config, "col_ecosystem"), width=10)
+    table.add_column(t(config, "col_items"), justify="right", width=7)
+    table.add_column(t(config, "col_size"), justify="right", width=10)
+    home = str(Path.home())
+    for n, idx in enumerate(rows, first + 1):
+        g = groups[idx]
+        size_str = format_size_mb(g.size_mb)
+        size_color = "red bold" if g.size_mb >= 500 else ("yellow" if g.size_mb >= 100 else "")
+        table.add_row(
+            str(n),
+            "[green]✓[/]" if idx in selected else "[dim]·[/]",
+            g.project.replace(home, "~"),
+            g.ecosystem,
+            str(len(g.results)),
+            f"[{size_color}]{size_str}[/]" if size_color else size_str,
+        )
+    return table
+
+
+def _parse_ranges(raw: str, upper: int) -> list[int]:
+    """'3', '2-5', '1,4 7' -> 0-based indexes < upper. Raises ValueError on bad input."""
+    picked: list[int] = []
+    for part in raw.replace(",", " ").split():
+        lo, _, hi = part.partition("-")
+        a, b = int(lo), int(hi or lo)
+        if not (1 <= a <= b <= upper):
+            raise ValueError(part)
+        picked.extend(range(a - 1, b))
+    return picked
+
+
+def _browse_groups(config: Config, groups: list[ResultGroup]) -> list[ResultGroup]:
+    """
+    Paginated view of grouped results; only the current page is rendered.
+    Everything starts selected; the user can filter, page and toggle groups.
+    Return the selected groups (empty if cancelled).
+    """
+    selected = set(range(len(groups)))
+    keys = [f"{g.project} {g.ecosystem}".lower() for g in groups]
+    visible = list(range(len(groups)))
+    page_size = max(5, console.size.height - 16)
+    page = 0
+    while True:
+        pages = max(1, -(-len(visible) // page_size))
+        page = max(0, min(page, pages - 1))
+        first = page * page_size
+        chosen = [groups[i] for i in sorted(selected)]
+        caption = t(
+            config,
+            "browse_status",
+            page + 1,
+            pages,
+            len(visible),
+            len(chosen),
+            format_size_mb(sum(g.size_mb for g in chosen)),
+        )
+        console.print(_groups_table(config, groups, visible[first:first + page_size], first, selected, caption))
+        if not sys.stdin.isatty():
+            return chosen
+        console.print(f"  {t(config, 'browse_help')}")
+        try:
+            cmd = (Prompt.ask(" ", default="", show_default=False) or "").strip()
+        except (KeyboardInterrupt, EOFError):
+            return []
+        low = cmd.lower()
+        if not cmd:
+            return chosen
+        if low in ("q", "quit", "exit", "esc"):
+            return []
+        if low == "n":
+            page += 1
+        elif low == "p":
+            page -= 1
+        elif cmd.startswith("/"):
+            query = low[1:].strip()
+            visible = [i for i, k in enumerate(keys) if query in k]
+            page = 0
+        elif low == "a":
+            selected.update(visible)
+        elif low == "x":
+            selected.difference_update(visible)
+        else:
+            try:
+                for n in _parse_ranges(cmd, len(visible)):
+                    selected.symmetric_difference_update({visible[n]})
+            except ValueError:
+                console.print(f"  [yellow]{t(config, 'number_invalid', len(visible))}[/]")
+
+
+def _scan_with_progress(
+    config: Config, stats: ScanStats, progress_cb=None, pipeline: "DeletePipeline | None" = None  # noqa: ANN001
+) -> RunSummary:
+    """
+    Dry-run scan under a Live progress display (kept until the pipeline's deletions
+    finish). With a pipeline, the scan is recorded by pipeline.close, without the
+    results it deleted.
+    """
+    with Live(_ScanProgress(config, stats, pipeline), console=console, refresh_per_second=SCAN_REFRESH_HZ):
+        if pipeline is None:
+            return scan(config, dry_run=True, progress_cb=progress_cb, stats=stats)
+        summary = Scanner(config).scan(dry_run=True, progress_cb=progress_cb, stats=stats)
+        pipeline.close(summary, stats)
+    return summary
+
+
+def _describe_rule(rule: DeleteRule) -> str:
+    parts = [p for p in (rule.name, rule.ecosystem) if p]
+    if rule.min_days:
+        parts.append(f"≥{rule.min_days:g}d")
+    if rule.min_size_mb:
+        parts.append(f"≥{format_size_mb(rule.min_size_mb)}")
+    return " ".join(parts)
+
+
+def _confirm_pipeline(config: Config) -> "DeletePipeline | None":
+    """Offer to delete results matching auto_delete_rules during the scan (interactive only)."""
+    rules = parse_rules(config.auto_delete_rules)
+    if not rules or not sys.stdin.isatty():
+        return None
+    choice = _select(
+        t(config, "pipeline_ask", ", ".join(_describe_rule(r) for r in rules)),
+        [
+            Choice(t(config, "pipeline_no"), value=False),
+            Choice(t(config, "pipeline_yes"), value=True),
+        ],
+    )
+    if not choice:
+        return None
+    console.print()
+    return DeletePipeline(config, rules)
+
+
+def _offer_attach(config: Config) -> bool:
+    """
+    Another run holds the lock: offer to follow its live results instead of
+    walking the same trees again. Return True if its results were shown.
+    """
+    console.print(f"  [yellow]{t(config, 'instance_busy')}[/]")
+    if not LIVE_SOCKET.exists() or not sys.stdin.isatty():
+        return False
+    choice = _select(
+        t(config, "attach_ask"),
+        [
+            Choice(t(config, "attach_yes"), value=True),
+            Choice(t(config, "attach_no"), value=False),
+        ],
+    )
+    if not choice:
+        return False
+    console.print()
+    count = 0
+    total_mb = 0.0
+    try:
+        for message in attach():
+            if message["event"] != "result":
+                continue
+            r = message["result"]
+            count += 1
+            total_mb += r.get("size_mb", 0) or 0
+            path = r["path"].replace(str(Path.home()), "~")
+            console.print(f"  [cyan]•[/] {path} [dim]({format_size_mb(r.get('size_mb', 0) or 0)})[/]")
+    except (OSError, ValueError):
+        console.print(f"  [yellow]{t(config, 'attach_failed')}[/]")
+        return False
+    console.print()
+    console.print(f"  [green]✓[/] {t(config, 'attach_done', count, format_size_mb(total_mb))}")
+    return True
+
+
 def run_dry_run(config: Config) -> None:
     console.print()
     console.print(
@@ -464,56 +872,50 @@ def run_dry_run(config: Config) -> None:
         )
     )
     console.print()
-    count: list[int] = [0]
-    with Progress(
-        SpinnerColumn("dots"),
-        TextColumn("[bold blue]{task.description}[/]"),
-        TextColumn("[dim]" + t(config, "found_count") + ": {task.fields[count]}[/]"),
-        console=console,
-    ) as progress:
-        task = progress.add_task(t(config, "scanning"), count=0)
+    stats = ScanStats()
+    pipeline = None
+    try:
+        with run_lock(blocking=False), LiveFeed() as feed:
+            pipeline = _confirm_pipeline(config)
 
-        def on_found(r: Any) -> None:
-            count[0] += 1
-            progress.update(task_id=task, fields={"count": count[0]})
+            def on_result(result: Any) -> None:
+                if pipeline is not None:
+                    pipeline.offer(result)
+                feed.publish(result)
 
-        summary = scan(config, dry_run=True, progress_cb=on_found)
+            summary = _scan_with_progress(config, stats, on_result, pipeline)
+            feed.close(summary)
+    except LockBusy:
+        if _offer_attach(config):
+            return
+        summary = _scan_with_progress(config, stats)
+
+    if pipeline is not None and pipeline.queued:
+        console.print(
+            f"  [green]✓[/] {t(config, 'pipeline_done', pipeline.done - pipeline.errors, format_size_mb(pipeline.freed_mb))}"
+        )
+        if pipeline.errors:
+            console.print(f"  [red]{t(config, 'pipeline_errors', pipeline.errors)}[/]")
 
     total = len(summary.results)
     console.print(f"  [green]✓[/] {t(config, 'total_found')}: [bold]{total}[/]")
+    if summary.partial:
+        console.print(f"  [yellow]{t(config, 'scan_partial')}[/]")
+    in_use = sum(1 for r in summary.results if r.get("skipped") == "in_use")
+    if in_use:
+        console.print(f"  [yellow]{t(config, 'in_use_note', in_use)}[/]")
     console.print()
     if total == 0:
         console.print(f"  [dim]{t(config, 'none_match', config.unused_hours)}[/]")
         return
 
-    table = Table(
-        title=f"  {t(config, 'table_would_delete')}",
-        box=box.SIMPLE_HEAVY,
-        header_style="bold cyan",
-        border_style="blue",
-        show_lines=False,
-        pad_edge=True,
-        row_styles=["", "dim"],
-    )
-    table.add_column("#", style="dim", width=4, justify="right")
-    table.add_column(t(config, "col_path"), overflow="fold", ratio=3)
-    table.add_column(t(config, "col_name"), width=16)
-    table.add_column(t(config, "col_type"), width=12)
-    table.add_column(t(config, "col_size"), justify="right", width=10)
-    table.add_column(t(config, "col_unused"), justify="right", width=12)
-    for i, r in enumerate(summary.results, 1):
-        short = r["path"].replace(str(Path.home()), "~")
-        size_str = format_size_mb(r["size_mb"])
-        size_color = "red bold" if r["size_mb"] >= 500 else ("yellow" if r["size_mb"] >= 100 else "")
-        table.add_row(
-            str(i),
-            short,
-            r["name"],
-            t(config, "type_file") if r.get("is_file") else t(config, "type_folder"),
-            f"[{size_color}]{size_str}[/]" if size_color else size_str,
-            format_unused_hours(r["unused_hours"]),
-        )
-    console.print(table)
+    groups = group_results(summary.results)
+    chosen = _browse_groups(config, groups)
+    summary.results = [r for g in chosen for r in g.results]
+    total = len(summary.results)
+    if total == 0:
+        console.print(f"  [dim]{t(config, 'nothing_selected')}[/]")
+        return
     total_mb = sum(r["size_mb"] for r in summary.results)
     console.print()
     console.print(
@@ -539,7 +941,10 @@ def run_dry_run(config: Config) -> None:
     if run_clean_now:
         try:
             console.print()
-            console.print(f"  [bold yellow]{t(config, 'warning_irreversible')}[/]")
+            if config.action == "archive":
+                console.print(f"  [bold cyan]{t(config, 'warning_archive', archive_dir(config))}[/]")
+            else:
+                console.print(f"  [bold yellow]{t(config, 'warning_irreversible')}[/]")
             console.print()
             if sys.stdin.isatty():
                 confirm_choice = _select(
@@ -575,12 +980,11 @@ def run_dry_run(config: Config) -> None:
                             status = f"[red]{t(config, 'error_deleting')}: {status}[/]"
                         progress.update(task_id=task, completed=current, status=status)
 
-                    freed = delete_from_summary(summary, progress_cb=on_delete)
+                    freed = delete_from_summary(summary, progress_cb=on_delete, config=config)
                     progress.update(task_id=task, completed=total, status="[green]✓[/]")
 
                 summary.dry_run = False
                 summary.total_freed_mb = freed
-                summary.results = [{**r, "deleted": True} for r in summary.results]
                 summary.save()
                 console.print()
                 expected_mb = sum(r["size_mb"] for r in summary.results)
@@ -596,7 +1000,7 @@ def run_dry_run(config: Config) -> None:
                         padding=(0, 2),
                     )
                 )
-                console.print(f"  {t(config, 'marker_note')}")
+                console.print(f"  {t(config, 'archive_note' if config.action == 'archive' else 'marker_note')}")
                 wait_enter(config)
         except (KeyboardInterrupt, EOFError):
             console.print(f"  [dim]{t(config, 'cancelled')}[/]")
@@ -637,6 +1041,122 @@ def run_history(config: Config) -> None:
             f"[{freed_style}]{freed_str}[/]" if freed_style else freed_str,
         )
     console.print(table)
+    if config.regrowth_aware:
+        _print_churn(config, runs)
+
+
+def _reinstalled_mb(runs: list[dict], event: Regrowth) -> float:
+    """Size of the target when it was last deleted before event (0 if history no longer has it)."""
+    for run in runs:
+        try:
+            ran_at = time.mktime(time.strptime(run["timestamp"], "%Y-%m-%d %H:%M:%S"))
+        except (KeyError, ValueError):
+            continue
+        if ran_at > event.deleted_at + 60:
+            continue
+        for r in run.get("results", []):
+            if r.get("path") == event.path and r.get("deleted"):
+                return r.get("size_mb", 0) or 0
+    return 0.0
+
+
+def _print_churn(config: Config, runs: list[dict]) -> None:
+    """Projects whose deleted targets came back soon, with the threshold they get now."""
+    log = RegrowthLog.load()
+    projects = log.projects()
+    if not projects:
+        return
+    churn = [e for e in log.events() if e.churn]
+    reinstalled = sum(_reinstalled_mb(runs, e) for e in churn)
+    home = str(Path.home())
+    table = Table(
+        title=f"  {t(config, 'churn_title')}",
+        caption="  " + t(
+            config, "churn_caption", len(churn), format_unused_hours(CHURN_HOURS), format_size_mb(reinstalled)
+        ),
+        box=box.SIMPLE_HEAVY,
+        header_style="bold cyan",
+        row_styles=["", "dim"],
+    )
+    table.add_column(t(config, "col_project"), overflow="fold", ratio=3)
+    table.add_column(t(config, "col_regrowths"), justify="right", width=7)
+    table.add_column(t(config, "col_regrown_after"), justify="right", width=14)
+    table.add_column(t(config, "col_threshold"), justify="right", width=12)
+    for project in projects[:15]:
+        events = [e for e in log.events(project) if e.churn]
+        table.add_row(
+            project.replace(home, "~"),
+            str(len(events)),
+            format_unused_hours(events[0].gap_hours),
+            f"[yellow]{format_unused_hours(log.threshold(project, config.unused_hours))}[/]",
+        )
+    console.print(table)
+
+
+def _usage_table(config: Config, index: SizeIndex, path: str, rows: list[tuple[str, int]]) -> Table:
+    total = index.size(path) if path else sum(size for _, size in rows)
+    home = str(Path.home())
+    title = path.replace(home, "~") if path else t(config, "explore_title", index.timestamp)
+    table = Table(
+        title=f"  {title}  [dim]{format_size_mb(total / (1024 * 1024))}[/]",
+        box=box.SIMPLE_HEAVY,
+        header_style="bold cyan",
+        row_styles=["", "dim"],
+    )
+    table.add_column("#", style="dim", width=5, justify="right")
+    table.add_column(t(config, "col_name"), overflow="fold", ratio=3)
+    table.add_column(t(config, "col_size"), justify="right", width=10)
+    table.add_column(t(config, "col_share"), width=32)
+    for n, (child, size) in enumerate(rows, 1):
+        name = child.replace(home, "~") if not path else os.path.basename(child)
+        if index.children(child):
+            name += "/"
+        pct = size / total * 100 if total else 0.0
+        table.add_row(str(n), name, format_size_mb(size / (1024 * 1024)), _disk_bar(pct))
+    rest = total - sum(size for _, size in rows)
+    if path and rest > 0 and rows:
+        table.add_row("", f"[dim]{t(config, 'explore_other')}[/]", format_size_mb(rest / (1024 * 1024)), "")
+    return table
+
+
+def run_explorer(config: Config) -> None:
+    """Browse the size index saved by the last scan, from the scan roots down to single packages."""
+    console.print()
+    index = SizeIndex.load()
+    if not index:
+        console.print(f"  {t(config, 'explore_empty')}")
+        return
+    if index.partial:
+        console.print(f"  {t(config, 'explore_partial')}")
+    trail: list[str] = []
+    page_size = max(5, console.size.height - 12)
+    while True:
+        path = trail[-1] if trail else ""
+        rows = (index.children(path) if path else index.top())[:page_size]
+        console.print(_usage_table(config, index, path, rows))
+        if not sys.stdin.isatty():
+            return
+        console.print(f"  {t(config, 'explore_help')}")
+        try:
+            cmd = (Prompt.ask(" ", default="", show_default=False) or "").strip().lower()
+        except (KeyboardInterrupt, EOFError):
+            return
+        if cmd in ("", "q", "quit", "exit", "esc"):
+            return
+        if cmd == "..":
+            if trail:
+                trail.pop()
+            continue
+        try:
+            n = int(cmd)
+            if not 1 <= n <= len(rows):
+                raise ValueError
+        except ValueError:
+            console.print(f"  [yellow]{t(config, 'number_invalid', len(rows))}[/]")
+            continue
+        child = rows[n - 1][0]
+        if index.children(child):
+            trail.append(child)
 
 
 def _open_config_in_editor(config: Config) -> bool:
@@ -696,12 +1216,15 @@ def run_settings(config: Config) -> None:
                 console.print(f"  [dim]{t(config, 'no_folders_configured')}[/]")
             else:
                 console.print(f"  [dim]{t(config, 'folders_list')}:[/]")
+                _, redundant = normalize_roots(config.scan_dirs, config.one_file_system)
                 for i, d in enumerate(config.scan_dirs, 1):
-                    exists = (
-                        f"[green]✓ {t(config, 'exists')}[/]"
-                        if Path(d).is_dir()
-                        else f"[red]✗ {t(config, 'not_exists')}[/]"
-                    )
+                    if d in redundant:
+                        covering = redundant[d].replace(str(Path.home()), "~")
+                        exists = f"[yellow]⚠ {t(config, 'redundant_root', covering)}[/]"
+                    elif Path(d).is_dir():
+                        exists = f"[green]✓ {t(config, 'exists')}[/]"
+                    else:
+                        exists = f"[red]✗ {t(config, 'not_exists')}[/]"
                     short = d.replace(str(Path.home()), "~")
                     console.print(f"    [cyan]{i}.[/] {short}  {exists}")
             console.print()
@@ -737,6 +1260,12 @@ def run_settings(config: Config) -> None:
                         console.print(f"[dim]{t(config, 'paths_skipped', skipped)}[/]")
                     else:
                         console.print()
+                _, redundant = normalize_roots(config.scan_dirs, config.one_file_system)
+                for d in config.scan_dirs[-added:]:
+                    if d in redundant:
+                        short = d.replace(str(Path.home()), "~")
+                        covering = redundant[d].replace(str(Path.home()), "~")
+                        console.print(f"  [yellow]⚠ {short}: {t(config, 'redundant_root', covering)}[/]")
             elif skipped > 0:
                 console.print(f"  [yellow]{t(config, 'path_already')}[/]")
             else:
@@ -848,10 +1377,194 @@ def _run_update_with_status(config: Config) -> None:
         pass
 
 
-def main() -> None:
+def run_plan_command(config: Config, output: str) -> None:
+    """sdevclean plan: dry-run scan and save a fingerprinted plan file."""
+    with console.status(f"[bold blue]{t(config, 'scanning')}[/]", spinner="dots"):
+        summary = scan(config, dry_run=True)
+        count = write_plan(summary, Path(output))
+    total_mb = sum(r["size_mb"] for r in summary.results)
+    console.print(f"  [green]{t(config, 'plan_written', output, count, format_size_mb(total_mb))}[/]")
+
+
+def run_apply_command(config: Config, plan_path: str) -> int:
+    """sdevclean apply: delete a plan's targets that are unchanged since planning."""
+    try:
+        plan = load_plan(Path(plan_path))
+    except (OSError, ValueError) as e:
+        console.print(f"  [red]{t(config, 'plan_invalid')}: {e}[/]")
+        return 1
+    total = len(plan.get("results", []))
+    with Progress(
+        SpinnerColumn("dots"),
+        TextColumn("[bold green]{task.description}[/]"),
+        BarColumn(bar_width=40, complete_style="green", finished_style="green"),
+        TaskProgressColumn(),
+        console=console,
+    ) as progress:
+        task = progress.add_task(t(config, "applying"), total=total)
+        summary = apply_plan(plan, progress_cb=lambda i, n, r: progress.update(task, completed=i), config=config)
+    deleted = sum(1 for r in summary.results if r["deleted"])
+    skipped = sum(1 for r in summary.results if r.get("skipped"))
+    body = (
+        f"[bold green]{t(config, 'plan_applied')}[/]\n\n"
+        f"  {t(config, 'space_freed')}: [bold]{format_size_mb(summary.total_freed_mb)}[/]\n"
+        f"  {t(config, 'folders_deleted')}: [bold]{deleted}[/]"
+    )
+    if skipped:
+        body += f"\n  [yellow]{t(config, 'plan_skipped', skipped)}[/]"
+    console.print(Panel(body, title=t(config, "result_title"), border_style="green", box=box.ROUNDED, padding=(0, 2)))
+    return 0
+
+
+def run_dedupe_command(config: Config, apply: bool, min_size: int) -> None:
+    """sdevclean dedupe: report (or replace with hardlinks) identical files across dependency folders."""
+    with console.status(f"[bold blue]{t(config, 'dedupe_scanning')}[/]", spinner="dots"):
+        if apply:
+            with run_lock():
+                report = dedupe(config, dry_run=False, min_size=min_size)
+        else:
+            report = dedupe(config, min_size=min_size)
+    body = f"[bold]{t(config, 'dedupe_title')}[/]\n\n  " + t(
+        config, "dedupe_summary", report.candidates, report.files, report.groups, report.duplicates
+    )
+    if apply:
+        body += f"\n  {t(config, 'dedupe_linked')}: [bold]{report.linked}[/]"
+        body += f"\n  {t(config, 'dedupe_reclaimed')}: [bold green]{format_size_mb(report.reclaimable_mb)}[/]"
+    else:
+        body += f"\n  {t(config, 'dedupe_reclaimable')}: [bold green]{format_size_mb(report.reclaimable_mb)}[/]"
+    for err in report.errors[:10]:
+        body += f"\n  [red]{t(config, 'error_deleting')}: {err}[/]"
+    console.print(Panel(body, border_style="cyan", box=box.ROUNDED, padding=(0, 2)))
+    if not apply and report.duplicates:
+        console.print(f"  {t(config, 'dedupe_hint')}")
+
+
+def run_caches_command(config: Config, apply: bool) -> int:
+    """sdevclean caches: report (or enforce) the cache_caps on the global package caches."""
+    if not config.cache_caps:
+        console.print(f"  {t(config, 'caches_none', ', '.join(KNOWN_CACHES))}")
+        return 1
+    with console.status(f"[bold blue]{t(config, 'caches_scanning')}[/]", spinner="dots"):
+        if apply:
+            with run_lock():
+                reports = cap_caches(config.cache_caps, dry_run=False)
+            write_cache_log(reports)
+        else:
+            reports = cap_caches(config.cache_caps)
+    if not reports:
+        console.print(f"  [dim]{t(config, 'caches_missing')}[/]")
+        return 0
+    table = Table(title=t(config, "caches_title"), box=box.ROUNDED, title_style="bold")
+    table.add_column(t(config, "col_cache"), style="cyan")
+    table.add_column(t(config, "col_path"))
+    table.add_column(t(config, "col_size"), justify="right")
+    table.add_column(t(config, "col_cap"), justify="right")
+    table.add_column(t(config, "col_evicted" if apply else "col_evict"), justify="right", style="green")
+    for r in reports:
+        table.add_row(
+            r.name,
+            r.path.replace(str(Path.home()), "~"),
+            format_size_mb(r.size_mb),
+            format_size_mb(r.cap_mb),
+            f"{format_size_mb(r.evicted_mb)} ({r.evicted})",
+        )
+    console.print(table)
+    for r in reports:
+        for err in r.errors[:10]:
+            console.print(f"  [red]{t(config, 'error_deleting')}: {err}[/]")
+    if not apply and any(r.evicted for r in reports):
+        console.print(f"  {t(config, 'caches_hint')}")
+    return 0
+
+
+def run_system_command(config: Config, apply: bool, parallel: int, workers: int, min_uid: int) -> int:
+    """sdevclean system: clean every user's home as that user (root only)."""
+    if os.geteuid() != 0:
+        console.print(f"  [red]{t(config, 'system_root')}[/]")
+        return 1
+    with console.status(f"[bold blue]{t(config, 'system_scanning')}[/]", spinner="dots"):
+        reports = run_system(apply, parallel, workers, min_uid)
+    if not reports:
+        console.print(f"  [dim]{t(config, 'system_none')}[/]")
+        return 0
+    table = Table(title=t(config, "system_mode_title"), box=box.ROUNDED, title_style="bold")
+    table.add_column(t(config, "col_user"), style="cyan")
+    table.add_column(t(config, "col_path"))
+    table.add_column(t(config, "col_found"), justify="right")
+    table.add_column(t(config, "col_freed"), justify="right", style="green")
+    table.add_column(t(config, "col_status"))
+    for r in reports:
+        status = f"[yellow]{r.skipped}[/]" if r.skipped else (f"[red]{r.errors} ✗[/]" if r.errors else "[green]✓[/]")
+        table.add_row(
+            r.user,
+            r.home,
+            f"{format_size_mb(r.found_mb)} ({r.found})",
+            format_size_mb(r.freed_mb),
+            status,
+        )
+    console.print(table)
+    if not apply and any(r.found for r in reports):
+        console.print(f"  {t(config, 'system_hint')}")
+    return 1 if any(r.errors or (r.skipped and r.skipped != "disabled") for r in reports) else 0
+
+
+def run_restore_command(config: Config, target: str) -> int:
+    """sdevclean restore: bring an archived folder back from cold storage."""
+    try:
+        with console.status(f"[bold blue]{target}[/]", spinner="dots"):
+            restored = restore(Path(target))
+    except (OSError, ArchiveError, KeyError, tarfile.TarError) as e:
+        console.print(f"  [red]{t(config, 'restore_fail')}: {e}[/]")
+        return 1
+    console.print(f"  [green]{t(config, 'restored', restored)}[/]")
+    return 0
+
+
+def _parse_args(argv: "list[str] | None") -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="sdevclean", description="Simple Dev Cleaner")
+    sub = parser.add_subparsers(dest="command")
+    plan_parser = sub.add_parser("plan", help="scan (dry run) and save the plan to a file")
+    plan_parser.add_argument("-o", "--output", default="plan.json", help="plan file (default: plan.json)")
+    apply_parser = sub.add_parser("apply", help="delete the targets of a plan that are unchanged")
+    apply_parser.add_argument("plan", help="plan file written by 'sdevclean plan'")
+    restore_parser = sub.add_parser("restore", help="bring back a folder archived with action = \"archive\"")
+    restore_parser.add_argument("target", help="archived folder path, or its .sdevclean-archive.toml marker")
+    dedupe_parser = sub.add_parser("dedupe", help="hardlink identical files across dependency folders")
+    dedupe_parser.add_argument("--apply", action="store_true", help="create the hardlinks (default: report only)")
+    dedupe_parser.add_argument("--min-size", type=int, default=4096, help="ignore files smaller than this (bytes)")
+    caches_parser = sub.add_parser("caches", help="keep global package caches under their cache_caps (LRU)")
+    caches_parser.add_argument("--apply", action="store_true", help="evict the entries (default: report only)")
+    system_parser = sub.add_parser("system", help="clean every user's home as that user (run as root)")
+    system_parser.add_argument("--apply", action="store_true", help="delete (default: dry run)")
+    system_parser.add_argument("--parallel", type=int, default=4, help="users cleaned at the same time")
+    system_parser.add_argument("--workers", type=int, default=2, help="max threads per device for each user")
+    system_parser.add_argument("--min-uid", type=int, default=MIN_UID, help="skip accounts below this uid")
+    return parser.parse_args(argv)
+
+
+def main(argv: "list[str] | None" = None) -> None:
     from simple_dev_cleaner._config import HISTORY_FILE
 
+    args = _parse_args(argv)
     config = Config.load()
+    unknown = unknown_names(config.target_names)
+    if unknown:
+        console.print(f"  {t(config, 'unknown_targets', ', '.join(unknown), ', '.join(registered_names()))}")
+    if args.command == "plan":
+        run_plan_command(config, args.output)
+        return
+    if args.command == "apply":
+        sys.exit(run_apply_command(config, args.plan))
+    if args.command == "restore":
+        sys.exit(run_restore_command(config, args.target))
+    if args.command == "dedupe":
+        run_dedupe_command(config, args.apply, args.min_size)
+        return
+    if args.command == "caches":
+        sys.exit(run_caches_command(config, args.apply))
+    if args.command == "system":
+        sys.exit(run_system_command(config, args.apply, args.parallel, args.workers, args.min_uid))
+
     if not getattr(config, "lang", "").strip():
         config.lang = "es"
         config.save()
@@ -878,6 +1591,8 @@ def main() -> None:
             elif option == "3":
                 run_settings(config)
                 config = Config.load()
+            elif option == "4":
+                run_explorer(config)
         except KeyboardInterrupt:
             console.print(f"\n  {t(config, 'interrupted')}")
         except Exception as e:
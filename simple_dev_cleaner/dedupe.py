@@ -0,0 +1,190 @@
+"""Hardlink dedupe: replace byte-identical files across dependency folders with hardlinks."""
+
+import hashlib
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional
+
+from simple_dev_cleaner.cleaner import Config, find_candidates
+
+PARTIAL_BYTES = 64 * 1024
+_CHUNK = 1024 * 1024
+
+
+@dataclass
+class _FileInfo:
+    path: str
+    dev: int
+    ino: int
+    size: int
+    mtime_ns: int
+    nlink: int
+    meta: tuple[int, int, int]  # (mode, uid, gid): links share them, so they must match
+
+
+@dataclass
+class DedupeReport:
+    candidates: int = 0
+    files: int = 0
+    groups: int = 0
+    duplicates: int = 0
+    reclaimable_mb: float = 0.0
+    linked: int = 0
+    dry_run: bool = True
+    errors: list[str] = field(default_factory=list)
+
+
+def _collect(folder: Path, min_size: int) -> list[_FileInfo]:
+    """Regular files >= min_size in folder, same device only, symlinks not followed."""
+    files: list[_FileInfo] = []
+    try:
+        root_dev = os.lstat(folder).st_dev
+    except OSError:
+        return files
+    stack = [str(folder)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            if stat.S_ISDIR(st.st_mode):
+                if st.st_dev == root_dev:
+                    stack.append(entry.path)
+            elif stat.S_ISREG(st.st_mode) and st.st_size >= min_size:
+                files.append(_FileInfo(
+                    entry.path, st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, st.st_nlink,
+                    (stat.S_IMODE(st.st_mode), st.st_uid, st.st_gid),
+                ))
+    return files
+
+
+def _hash(path: str, limit: Optional[int]) -> Optional[bytes]:
+    h = hashlib.blake2b(digest_size=32)
+    remaining = limit
+    try:
+        with open(path, "rb") as f:
+            while remaining is None or remaining > 0:
+                chunk = f.read(_CHUNK if remaining is None else min(_CHUNK, remaining))
+                if not chunk:
+                    break
+                h.update(chunk)
+                if remaining is not None:
+                    remaining -= len(chunk)
+    except OSError:
+        return None
+    return h.digest()
+
+
+def _refine(
+    groups: Iterable[list[_FileInfo]], pool: ThreadPoolExecutor, limit: Optional[int]
+) -> list[list[_FileInfo]]:
+    """Split each group by content hash (first `limit` bytes, or all); keep groups of 2+."""
+    groups = list(groups)
+    flat = [info for group in groups for info in group]
+    digests = dict(zip((id(i) for i in flat), pool.map(lambda i: _hash(i.path, limit), flat)))
+    refined: list[list[_FileInfo]] = []
+    for group in groups:
+        by_digest: dict[bytes, list[_FileInfo]] = {}
+        for info in group:
+            digest = digests[id(info)]
+            if digest is not None:
+                by_digest.setdefault(digest, []).append(info)
+        refined.extend(g for g in by_digest.values() if len(g) > 1)
+    return refined
+
+
+def _unchanged(info: _FileInfo) -> bool:
+    """Whether info.path is still the file that was hashed."""
+    try:
+        st = os.lstat(info.path)
+    except OSError:
+        return False
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns) == (info.dev, info.ino, info.size, info.mtime_ns)
+
+
+def _link(src: _FileInfo, dst: _FileInfo) -> None:
+    """Atomically replace dst with a hardlink to src, if neither changed since they were hashed."""
+    for info in (src, dst):
+        if not _unchanged(info):
+            raise OSError(f"changed while deduplicating: {info.path}")
+    tmp = os.path.join(os.path.dirname(dst.path), f".{os.path.basename(dst.path)}.sdc-link")
+    os.link(src.path, tmp)
+    try:
+        os.replace(tmp, dst.path)
+    except OSError:
+        os.unlink(tmp)
+        raise
+
+
+def dedupe(
+    config: Config,
+    dry_run: bool = True,
+    min_size: int = 4096,
+    workers: int = 8,
+) -> DedupeReport:
+    """
+    Find identical files across all dependency folders (live ones included) and,
+    unless dry_run, replace duplicates with hardlinks to one copy.
+    Files are grouped by (device, size, mode/owner), then by a hash of the first
+    64 KiB, then by a full hash; hashing runs on a thread pool. Links never
+    cross devices. reclaimable_mb only counts inodes whose every link is replaced.
+    """
+    report = DedupeReport(dry_run=dry_run)
+    folders = [path for path, _ in find_candidates(config)]
+    report.candidates = len(folders)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="sdc-dedupe") as pool:
+        by_key: dict[tuple, dict[int, list[_FileInfo]]] = {}
+        for files in pool.map(lambda f: _collect(f, min_size), folders):
+            report.files += len(files)
+            for info in files:
+                key = (info.dev, info.size, info.meta)
+                by_key.setdefault(key, {}).setdefault(info.ino, []).append(info)
+        # Paths already sharing an inode count once; groups hold one file per inode.
+        links_by_inode: dict[tuple[int, int], list[_FileInfo]] = {}
+        groups: list[list[_FileInfo]] = []
+        for same_key in by_key.values():
+            for links in same_key.values():
+                links_by_inode[(links[0].dev, links[0].ino)] = links
+            if len(same_key) > 1:
+                groups.append([links[0] for links in same_key.values()])
+        groups = _refine(groups, pool, PARTIAL_BYTES)
+        # Files no larger than the partial read are already fully hashed.
+        small = [g for g in groups if g[0].size <= PARTIAL_BYTES]
+        large = [g for g in groups if g[0].size > PARTIAL_BYTES]
+        groups = small + _refine(large, pool, None)
+
+    reclaimable = 0
+    for group in groups:
+        group.sort(key=lambda i: (-i.nlink, i.path))
+        src = group[0]
+        report.groups += 1
+        for dup in group[1:]:
+            links = links_by_inode[(dup.dev, dup.ino)]
+            report.duplicates += len(links)
+            if dry_run:
+                if len(links) == dup.nlink:
+                    reclaimable += dup.size
+                continue
+            replaced = 0
+            for link in links:
+                try:
+                    _link(src, link)
+                    replaced += 1
+                    report.linked += 1
+                except OSError as e:
+                    report.errors.append(f"{link.path}: {e}")
+            if replaced == dup.nlink:
+                reclaimable += dup.size
+    report.reclaimable_mb = round(reclaimable / (1024 * 1024), 1)
+    return report
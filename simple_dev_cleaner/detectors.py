@@ -0,0 +1,79 @@
+"""Ecosystem detectors: which folder names are dependency/build dirs and how to confirm them."""
+
+import os
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+@dataclass(frozen=True)
+class Detector:
+    """
+    A dependency/build folder kind claimed by an ecosystem.
+    A folder named like one of `names` is confirmed when its parent listing holds
+    one of `siblings` (e.g. package.json next to node_modules), or, failing that,
+    when one of the `inside` relative paths exists in the folder itself.
+    `validate` replaces both checks for kinds that need custom logic.
+    """
+    ecosystem: str
+    names: tuple[str, ...]
+    siblings: tuple[str, ...] = ()
+    inside: tuple[str, ...] = ()
+    validate: Optional[Callable[[str, frozenset[str]], bool]] = None
+
+    def matches_siblings(self, parent_names: frozenset[str]) -> bool:
+        return bool(self.siblings) and not parent_names.isdisjoint(self.siblings)
+
+    def matches_inside(self, path: str, exists: Callable[[str], bool] = os.path.exists) -> bool:
+        """The check that looks inside the folder (worth caching while the folder is unchanged)."""
+        return any(exists(os.path.join(path, rel)) for rel in self.inside)
+
+    def matches(
+        self, path: str, parent_names: frozenset[str], exists: Callable[[str], bool] = os.path.exists
+    ) -> bool:
+        if self.validate is not None:
+            return self.validate(path, parent_names)
+        return self.matches_siblings(parent_names) or self.matches_inside(path, exists)
+
+
+_REGISTRY: dict[str, list[Detector]] = {}
+
+
+def register(detector: Detector) -> Detector:
+    """Add a detector; later registrations for the same name are tried after earlier ones."""
+    for name in detector.names:
+        _REGISTRY.setdefault(name, []).append(detector)
+    return detector
+
+
+def registered_names() -> list[str]:
+    return sorted(_REGISTRY)
+
+
+def unknown_names(target_names: list[str]) -> list[str]:
+    """Configured target_names no ecosystem registers (dispatch_table leaves them out)."""
+    return [name for name in target_names if name not in _REGISTRY]
+
+
+def dispatch_table(target_names: list[str]) -> dict[str, tuple[Detector, ...]]:
+    """Detectors for the configured target_names, keyed by folder name."""
+    return {name: tuple(_REGISTRY[name]) for name in target_names if name in _REGISTRY}
+
+
+# ── Built-in ecosystems ─────────────────────────────────────────────────────
+
+register(Detector(
+    "python",
+    ("venv", ".venv", "env", "ENV", "env.bak", "venv.bak"),
+    inside=("pyvenv.cfg", os.path.join("bin", "activate")),
+))
+register(Detector("python", (".tox",), siblings=("tox.ini", "pyproject.toml", "setup.cfg")))
+register(Detector("python", (".nox",), siblings=("noxfile.py",)))
+register(Detector("node", ("node_modules",), siblings=("package.json",)))
+register(Detector("node", (".next", ".nuxt"), siblings=("package.json",)))
+register(Detector("rust", ("target",), siblings=("Cargo.toml",)))
+register(Detector("maven", ("target",), siblings=("pom.xml",)))
+register(Detector(
+    "gradle",
+    ("build",),
+    siblings=("build.gradle", "build.gradle.kts", "settings.gradle", "settings.gradle.kts"),
+))
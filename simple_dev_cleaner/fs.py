@@ -0,0 +1,511 @@
+"""Filesystem backends for the scan, size and delete engines: the real one and an in-memory fake."""
+
+import errno
+import itertools
+import os
+import random
+import shutil
+import stat
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Union
+
+# on_dir(entries removed, seconds) for each directory an rmtree empties.
+DirCallback = Callable[[int, float], None]
+
+
+class FileSystem(ABC):
+    """
+    The calls the engines make. scandir returns a materialized listing whose
+    entries follow the os.DirEntry API (name, path, inode(), is_dir/is_file/
+    is_symlink(follow_symlinks=...), stat(follow_symlinks=...)).
+    """
+
+    @abstractmethod
+    def scandir(self, path: str) -> list:
+        ...
+
+    @abstractmethod
+    def stat(self, path: str) -> Any:
+        ...
+
+    @abstractmethod
+    def lstat(self, path: str) -> Any:
+        ...
+
+    @abstractmethod
+    def exists(self, path: str) -> bool:
+        ...
+
+    @abstractmethod
+    def is_dir(self, path: str) -> bool:
+        ...
+
+    @abstractmethod
+    def resolve(self, path: str) -> str:
+        """Absolute path with ~ expanded and symlinks resolved."""
+
+    @abstractmethod
+    def unlink(self, path: str) -> None:
+        ...
+
+    @abstractmethod
+    def rmdir(self, path: str) -> None:
+        ...
+
+    @abstractmethod
+    def rmtree(self, path: str, inode_order: bool = False, on_dir: Optional[DirCallback] = None) -> None:
+        """
+        Remove a directory tree; symlinks in it are removed, not followed. With
+        inode_order or on_dir, each directory is listed once and its files (in
+        inode order if asked) are unlinked before descending; on_dir gets the
+        files plus the directory itself and the seconds taken.
+        """
+
+    @abstractmethod
+    def read_text(self, path: str) -> str:
+        ...
+
+    @abstractmethod
+    def write_text(self, path: str, text: str) -> None:
+        ...
+
+
+class OSFileSystem(FileSystem):
+    """The local filesystem (os / shutil)."""
+
+    def scandir(self, path: str) -> list:
+        with os.scandir(path) as it:
+            return list(it)
+
+    def stat(self, path: str) -> os.stat_result:
+        return os.stat(path)
+
+    def lstat(self, path: str) -> os.stat_result:
+        return os.lstat(path)
+
+    def exists(self, path: str) -> bool:
+        return os.path.exists(path)
+
+    def is_dir(self, path: str) -> bool:
+        return os.path.isdir(path)
+
+    def resolve(self, path: str) -> str:
+        return str(Path(path).expanduser().resolve())
+
+    def unlink(self, path: str) -> None:
+        os.unlink(path)
+
+    def rmdir(self, path: str) -> None:
+        os.rmdir(path)
+
+    def rmtree(self, path: str, inode_order: bool = False, on_dir: Optional[DirCallback] = None) -> None:
+        if not (inode_order or on_dir) or not _FD_WALK:
+            shutil.rmtree(path)
+            return
+        # Every directory is opened relative to its parent without following
+        # symlinks, so one swapped in mid-walk cannot redirect the deletion.
+        fd = os.open(path, _DIR_FLAGS)
+        try:
+            _rmtree_at(fd, inode_order, on_dir)
+        finally:
+            os.close(fd)
+        os.rmdir(path)
+
+    def read_text(self, path: str) -> str:
+        return Path(path).read_text(encoding="utf-8", errors="replace")
+
+    def write_text(self, path: str, text: str) -> None:
+        Path(path).write_text(text)
+
+
+_DIR_FLAGS = os.O_RDONLY | os.O_DIRECTORY | os.O_NOFOLLOW | getattr(os, "O_CLOEXEC", 0)
+# The same condition shutil.rmtree uses for its symlink-attack-safe walk.
+_FD_WALK = (
+    {os.open, os.stat, os.unlink, os.rmdir} <= os.supports_dir_fd
+    and os.scandir in os.supports_fd
+    and os.stat in os.supports_follow_symlinks
+)
+
+
+def entry_inode(entry: Any) -> int:
+    """d_ino from the directory listing (no extra syscall on POSIX); the sort key for inode order."""
+    try:
+        return entry.inode()
+    except OSError:
+        return 0
+
+
+def _unlink_files(fd: int, inode_order: bool, on_dir: Optional[DirCallback]) -> list[str]:
+    """Unlink everything but subdirectories in the directory open at fd; return the subdirectories."""
+    started = time.perf_counter()
+    with os.scandir(fd) as it:
+        listing = list(it)
+    if inode_order:
+        listing.sort(key=entry_inode)
+    subdirs = []
+    for entry in listing:
+        if entry.is_dir(follow_symlinks=False):
+            subdirs.append(entry.name)
+        else:
+            os.unlink(entry.name, dir_fd=fd)
+    if on_dir is not None:
+        on_dir(len(listing) - len(subdirs) + 1, time.perf_counter() - started)
+    return subdirs
+
+
+def _rmtree_at(top: int, inode_order: bool, on_dir: Optional[DirCallback]) -> None:
+    """Empty the directory open at top (left open): files first, then each subdirectory."""
+    # (fd, its name in the parent, subdirectories left); one fd open per level.
+    stack: list[tuple[int, str, Iterator[str]]] = [(top, "", iter(_unlink_files(top, inode_order, on_dir)))]
+    try:
+        while stack:
+            fd, name, subdirs = stack[-1]
+            sub_name = next(subdirs, None)
+            if sub_name is None:
+                stack.pop()
+                if stack:
+                    os.close(fd)
+                    os.rmdir(name, dir_fd=stack[-1][0])
+                continue
+            try:
+                sub = os.open(sub_name, _DIR_FLAGS, dir_fd=fd)
+            except OSError as e:
+                # Replaced by a file or a symlink since it was listed.
+                if e.errno not in (errno.ENOTDIR, errno.ELOOP):
+                    raise
+                os.unlink(sub_name, dir_fd=fd)
+                continue
+            try:
+                listing = _unlink_files(sub, inode_order, on_dir)
+            except BaseException:
+                os.close(sub)
+                raise
+            stack.append((sub, sub_name, iter(listing)))
+    finally:
+        for fd, _, _ in stack[1:]:
+            os.close(fd)
+
+
+LOCAL = OSFileSystem()
+
+
+# ── In-memory fake ──────────────────────────────────────────────────────────
+
+@dataclass
+class FakeStat:
+    st_mode: int
+    st_ino: int
+    st_dev: int
+    st_nlink: int
+    st_size: int
+    st_atime: float
+    st_mtime: float
+
+    @property
+    def st_mtime_ns(self) -> int:
+        return int(self.st_mtime * 1e9)
+
+    @property
+    def st_atime_ns(self) -> int:
+        return int(self.st_atime * 1e9)
+
+
+@dataclass
+class _Node:
+    st: FakeStat
+    children: Optional[dict[str, "_Node"]] = None
+    target: Optional[str] = None  # symlinks
+    text: Optional[str] = None  # files created with content
+
+
+class FakeEntry:
+    """os.DirEntry look-alike; stat() goes through the backend like an lstat would."""
+
+    def __init__(self, fs: "FakeFileSystem", path: str, name: str, node: _Node) -> None:
+        self._fs = fs
+        self._node = node
+        self.path = path
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"<FakeEntry {self.name!r}>"
+
+    def inode(self) -> int:
+        return self._node.st.st_ino
+
+    def is_symlink(self) -> bool:
+        return self._node.target is not None
+
+    def _follow(self, follow_symlinks: bool) -> Optional[_Node]:
+        if follow_symlinks and self._node.target is not None:
+            return self._fs._lookup(os.path.join(os.path.dirname(self.path), self._node.target))
+        return self._node
+
+    def is_dir(self, follow_symlinks: bool = True) -> bool:
+        node = self._follow(follow_symlinks)
+        return node is not None and node.children is not None
+
+    def is_file(self, follow_symlinks: bool = True) -> bool:
+        node = self._follow(follow_symlinks)
+        return node is not None and node.children is None and node.target is None
+
+    def stat(self, follow_symlinks: bool = True) -> FakeStat:
+        return self._fs.stat(self.path) if follow_symlinks else self._fs.lstat(self.path)
+
+
+class FakeFileSystem(FileSystem):
+    """
+    In-memory tree for exercising the engines without touching disk.
+
+    latency: seconds slept per call, either for every operation or per op name
+    ("scandir", "stat", "lstat", "exists", "is_dir", "unlink", "rmdir", "read_text", "write_text").
+    error_rate: probability (from a seeded RNG, so runs are repeatable) that any
+    call fails with EACCES; fail() adds deterministic failures for a subtree.
+    calls counts every operation, for comparing strategies.
+    """
+
+    def __init__(
+        self, latency: Union[float, dict[str, float]] = 0.0, error_rate: float = 0.0, seed: int = 0
+    ) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.calls: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._failures: list[tuple[str, str, int]] = []
+        self._lock = threading.Lock()
+        self._ino = itertools.count(2)
+        self._root = _Node(self._stat(stat.S_IFDIR | 0o755, dev=1), children={})
+
+    # Building the tree
+
+    def _stat(self, mode: int, dev: int = 1, size: int = 0, atime: Optional[float] = None,
+              mtime: Optional[float] = None, nlink: int = 1) -> FakeStat:
+        now = time.time()
+        mtime = now if mtime is None else mtime
+        return FakeStat(mode, next(self._ino), dev, nlink, size, mtime if atime is None else atime, mtime)
+
+    def _parent(self, path: str) -> tuple[_Node, str]:
+        parent_path, name = os.path.split(os.path.normpath(path))
+        parent = self._root
+        for part in parent_path.strip("/").split("/"):
+            if not part:
+                continue
+            child = parent.children.get(part)
+            if child is None:
+                child = _Node(self._stat(stat.S_IFDIR | 0o755, dev=parent.st.st_dev), children={})
+                parent.children[part] = child
+                parent.st.st_mtime = time.time()
+            parent = child
+        return parent, name
+
+    def add_dir(self, path: str, dev: Optional[int] = None, atime: Optional[float] = None) -> None:
+        """Create a directory (and its parents). dev marks a mount point for everything below it."""
+        parent, name = self._parent(path)
+        node = parent.children.get(name)
+        if node is None:
+            node = parent.children[name] = _Node(
+                self._stat(stat.S_IFDIR | 0o755, dev=dev or parent.st.st_dev, atime=atime), children={}
+            )
+            parent.st.st_mtime = time.time()
+        elif atime is not None:
+            node.st.st_atime = atime
+
+    def add_file(self, path: str, size: int = 0, atime: Optional[float] = None,
+                 mtime: Optional[float] = None, nlink: int = 1, text: Optional[str] = None) -> None:
+        """A regular file; with text, size is the text's length in UTF-8 and read_text returns it."""
+        if text is not None:
+            size = len(text.encode("utf-8"))
+        parent, name = self._parent(path)
+        if name not in parent.children:
+            parent.st.st_mtime = time.time()
+        parent.children[name] = _Node(
+            self._stat(stat.S_IFREG | 0o644, parent.st.st_dev, size, atime, mtime, nlink), text=text
+        )
+
+    def add_symlink(self, path: str, target: str) -> None:
+        parent, name = self._parent(path)
+        parent.children[name] = _Node(self._stat(stat.S_IFLNK | 0o777, parent.st.st_dev), target=target)
+        parent.st.st_mtime = time.time()
+
+    def add_tree(self, root: str, depth: int, fanout: int, files: int, size: int = 4096,
+                 atime: Optional[float] = None) -> int:
+        """Uniform synthetic tree (fanout subdirs and `files` files per level). Return entries created."""
+        self.add_dir(root, atime=atime)
+        created = 0
+        level = [root]
+        for d in range(depth):
+            next_level = []
+            for directory in level:
+                for i in range(files):
+                    self.add_file(f"{directory}/f{i}", size, atime)
+                created += files
+                if d + 1 < depth:
+                    for i in range(fanout):
+                        sub = f"{directory}/d{i}"
+                        self.add_dir(sub, atime=atime)
+                        next_level.append(sub)
+                    created += fanout
+            level = next_level
+        return created
+
+    def fail(self, op: str, prefix: str, code: int = errno.EACCES) -> None:
+        """Make op ("*" for all) fail with code for prefix and everything below it."""
+        self._failures.append((op, os.path.normpath(prefix), code))
+
+    # Call plumbing
+
+    def _call(self, op: str, path: str) -> None:
+        with self._lock:
+            self.calls[op] += 1
+            storm = self.error_rate and self._rng.random() < self.error_rate
+        delay = self.latency.get(op, 0.0) if isinstance(self.latency, dict) else self.latency
+        if delay:
+            time.sleep(delay)
+        path = os.path.normpath(path)
+        for fail_op, prefix, code in self._failures:
+            if fail_op in (op, "*") and (path == prefix or path.startswith(prefix.rstrip("/") + "/")):
+                raise OSError(code, os.strerror(code), path)
+        if storm:
+            raise OSError(errno.EACCES, os.strerror(errno.EACCES), path)
+
+    def _lookup(self, path: str, follow: bool = True, _hops: int = 0) -> Optional[_Node]:
+        node = self._root
+        parts = [p for p in os.path.normpath(path).split("/") if p]
+        for i, part in enumerate(parts):
+            if node.children is None:
+                return None
+            node = node.children.get(part)
+            if node is None:
+                return None
+            last = i == len(parts) - 1
+            if node.target is not None and (follow or not last):
+                if _hops > 40:
+                    return None
+                rest = "/".join(parts[i + 1:])
+                target = os.path.join(os.path.dirname("/" + "/".join(parts[:i + 1])), node.target)
+                return self._lookup(os.path.join(target, rest) if rest else target, follow, _hops + 1)
+        return node
+
+    def _get(self, path: str, follow: bool = True) -> _Node:
+        node = self._lookup(path, follow)
+        if node is None:
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), path)
+        return node
+
+    # FileSystem API
+
+    def scandir(self, path: str) -> list:
+        self._call("scandir", path)
+        node = self._get(path)
+        if node.children is None:
+            raise NotADirectoryError(errno.ENOTDIR, os.strerror(errno.ENOTDIR), path)
+        with self._lock:
+            items = list(node.children.items())
+        return [FakeEntry(self, os.path.join(path, name), name, child) for name, child in items]
+
+    def stat(self, path: str) -> FakeStat:
+        self._call("stat", path)
+        return self._get(path).st
+
+    def lstat(self, path: str) -> FakeStat:
+        self._call("lstat", path)
+        return self._get(path, follow=False).st
+
+    def exists(self, path: str) -> bool:
+        try:
+            self._call("exists", path)
+        except OSError:
+            return False
+        return self._lookup(path) is not None
+
+    def is_dir(self, path: str) -> bool:
+        try:
+            self._call("is_dir", path)
+        except OSError:
+            return False
+        node = self._lookup(path)
+        return node is not None and node.children is not None
+
+    def resolve(self, path: str) -> str:
+        """Like Path.resolve(strict=False): fake symlinks are followed, missing parts kept as given."""
+        parts = [p for p in path.split("/") if p]
+        resolved = "/"
+        hops = 0
+        while parts:
+            part = parts.pop(0)
+            if part == ".":
+                continue
+            if part == "..":
+                resolved = os.path.dirname(resolved)
+                continue
+            candidate = os.path.join(resolved, part)
+            node = self._lookup(candidate, follow=False)
+            if node is None or node.target is None:
+                resolved = candidate
+                continue
+            hops += 1
+            if hops > 40:
+                raise OSError(errno.ELOOP, os.strerror(errno.ELOOP), path)
+            if node.target.startswith("/"):
+                resolved = "/"
+            parts = [p for p in node.target.split("/") if p] + parts
+        return resolved
+
+    def _remove(self, path: str, want_dir: bool) -> None:
+        parent_path, name = os.path.split(os.path.normpath(path))
+        parent = self._get(parent_path)
+        with self._lock:
+            node = (parent.children or {}).get(name)
+            if node is None:
+                raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), path)
+            is_dir = node.children is not None
+            if want_dir and not is_dir:
+                raise NotADirectoryError(errno.ENOTDIR, os.strerror(errno.ENOTDIR), path)
+            if not want_dir and is_dir:
+                raise IsADirectoryError(errno.EISDIR, os.strerror(errno.EISDIR), path)
+            if want_dir and node.children:
+                raise OSError(errno.ENOTEMPTY, os.strerror(errno.ENOTEMPTY), path)
+            del parent.children[name]
+            parent.st.st_mtime = time.time()
+
+    def unlink(self, path: str) -> None:
+        self._call("unlink", path)
+        self._remove(path, want_dir=False)
+
+    def rmdir(self, path: str) -> None:
+        self._call("rmdir", path)
+        self._remove(path, want_dir=True)
+
+    def rmtree(self, path: str, inode_order: bool = False, on_dir: Optional[DirCallback] = None) -> None:
+        """Bottom-up like shutil.rmtree: one scandir per directory, one unlink/rmdir per entry."""
+        started = time.perf_counter()
+        listing = self.scandir(path)
+        if inode_order:
+            listing.sort(key=entry_inode)
+        subdirs = []
+        for entry in listing:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            else:
+                self.unlink(entry.path)
+        if on_dir is not None:
+            on_dir(len(listing) - len(subdirs) + 1, time.perf_counter() - started)
+        for sub in subdirs:
+            self.rmtree(sub, inode_order, on_dir)
+        self.rmdir(path)
+
+    def read_text(self, path: str) -> str:
+        self._call("read_text", path)
+        node = self._get(path)
+        if node.children is not None:
+            raise IsADirectoryError(errno.EISDIR, os.strerror(errno.EISDIR), path)
+        return node.text if node.text is not None else "\0" * node.st.st_size
+
+    def write_text(self, path: str, text: str) -> None:
+        self._call("write_text", path)
+        self.add_file(path, text=text)
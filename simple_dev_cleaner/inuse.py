@@ -0,0 +1,82 @@
+"""In-use guard: which paths running processes hold, from one /proc snapshot per run."""
+
+import os
+from bisect import bisect_left
+from typing import Iterable, Iterator, Optional
+
+PROC = "/proc"
+_DELETED = " (deleted)"
+
+
+def _link(path: str) -> Optional[str]:
+    try:
+        target = os.readlink(path)
+    except OSError:
+        return None
+    if target.endswith(_DELETED):
+        target = target[: -len(_DELETED)]
+    # fd links also point at pipes/sockets ("pipe:[123]"); keep real paths only.
+    return target if target.startswith("/") else None
+
+
+def _process_paths(pid_dir: str) -> Iterator[Optional[str]]:
+    """cwd, exe, open files and mapped files of one process (unreadable parts are skipped)."""
+    yield _link(os.path.join(pid_dir, "cwd"))
+    yield _link(os.path.join(pid_dir, "exe"))
+    fd_dir = os.path.join(pid_dir, "fd")
+    try:
+        fds = os.listdir(fd_dir)
+    except OSError:
+        fds = []
+    for fd in fds:
+        yield _link(os.path.join(fd_dir, fd))
+    try:
+        with open(os.path.join(pid_dir, "maps"), encoding="utf-8", errors="replace") as f:
+            for line in f:
+                # address perms offset dev inode [pathname]; the path may contain spaces.
+                fields = line.rstrip("\n").split(None, 5)
+                if len(fields) == 6 and fields[5].startswith("/"):
+                    path = fields[5]
+                    yield path[: -len(_DELETED)] if path.endswith(_DELETED) else path
+    except OSError:
+        pass
+
+
+class InUseIndex:
+    """
+    Sorted list of paths held by running processes. holder(target) finds any
+    held path equal to or below target with two binary searches, so checking
+    thousands of candidates costs O(log n) each after a single /proc pass.
+    """
+
+    def __init__(self, paths: Iterable[str] = ()) -> None:
+        self._paths = sorted({os.path.normpath(p) for p in paths})
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    @classmethod
+    def snapshot(cls, proc: str = PROC) -> "InUseIndex":
+        """Index every running process visible to us; empty where /proc is unavailable (macOS)."""
+        try:
+            pids = [name for name in os.listdir(proc) if name.isdigit()]
+        except OSError:
+            return cls()
+        paths: set[str] = set()
+        for pid in pids:
+            paths.update(p for p in _process_paths(os.path.join(proc, pid)) if p)
+        return cls(paths)
+
+    def holder(self, target: str) -> Optional[str]:
+        """A held path equal to or inside target, or None."""
+        paths = self._paths
+        target = os.path.normpath(target)
+        i = bisect_left(paths, target)
+        if i < len(paths) and paths[i] == target:
+            return target
+        # "target-x" sorts between "target" and "target/", so search the prefix itself.
+        prefix = target.rstrip("/") + "/"
+        i = bisect_left(paths, prefix)
+        if i < len(paths) and paths[i].startswith(prefix):
+            return paths[i]
+        return None
@@ -0,0 +1,168 @@
+"""Single-instance locking in CONFIG_DIR and a local socket to follow a running scan."""
+
+import fcntl
+import json
+import os
+import socket
+import threading
+from contextlib import contextmanager
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from simple_dev_cleaner._config import CONFIG_DIR
+
+RUN_LOCK = CONFIG_DIR / "run.lock"
+HISTORY_LOCK = CONFIG_DIR / "history.lock"
+LIVE_SOCKET = CONFIG_DIR / "live.sock"
+
+# Seconds a slow attached client may block the scan before it is dropped.
+_CLIENT_TIMEOUT = 1.0
+
+
+class LockBusy(Exception):
+    """Another process holds the lock."""
+
+
+# Locks held by this process: path -> [fd, depth]. flock() locks belong to the
+# open file, so nested acquisitions in one process must reuse the same fd.
+_held: dict[str, list[int]] = {}
+_held_guard = threading.RLock()
+
+
+@contextmanager
+def file_lock(path: Path, blocking: bool = True) -> Iterator[None]:
+    """
+    Exclusive advisory lock on path (re-entrant within the process).
+    With blocking=False, raise LockBusy instead of waiting for another process.
+    """
+    key = str(path)
+    with _held_guard:
+        entry = _held.get(key)
+        if entry is None:
+            fd = os.open(key, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                os.close(fd)
+                raise LockBusy(key) from None
+            os.ftruncate(fd, 0)
+            os.write(fd, f"{os.getpid()}\n".encode())
+            entry = _held[key] = [fd, 0]
+        entry[1] += 1
+    try:
+        yield
+    finally:
+        with _held_guard:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del _held[key]
+                os.close(entry[0])
+
+
+def run_lock(blocking: bool = True):  # noqa: ANN201
+    """Lock serializing destructive runs (scheduled agent, interactive clean, apply)."""
+    return file_lock(RUN_LOCK, blocking)
+
+
+def history_lock():  # noqa: ANN201
+    """Lock around read-modify-write of history.toml."""
+    return file_lock(HISTORY_LOCK)
+
+
+class LiveFeed:
+    """
+    Publish a running scan's results to other local sessions over a Unix socket.
+    Each client first gets the results found so far, then new ones as JSON lines,
+    and finally a {"event": "done"} line.
+    """
+
+    def __init__(self, path: Path = LIVE_SOCKET) -> None:
+        self.path = path
+        self._lines: list[bytes] = []
+        self._clients: list[socket.socket] = []
+        self._lock = threading.Lock()
+        self._server: Optional[socket.socket] = None
+
+    def start(self) -> "LiveFeed":
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+        try:
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(str(self.path))
+            server.listen()
+        except OSError:
+            return self  # Attaching is optional; the scan works without it.
+        self._server = server
+        threading.Thread(target=self._accept_loop, name="sdc-live", daemon=True).start()
+        return self
+
+    def _accept_loop(self) -> None:
+        server = self._server
+        while server is not None:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            conn.settimeout(_CLIENT_TIMEOUT)
+            with self._lock:
+                try:
+                    for line in self._lines:
+                        conn.sendall(line)
+                except OSError:
+                    conn.close()
+                    continue
+                self._clients.append(conn)
+
+    def _send(self, message: dict) -> None:
+        line = (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            self._lines.append(line)
+            for conn in list(self._clients):
+                try:
+                    conn.sendall(line)
+                except OSError:
+                    self._clients.remove(conn)
+                    conn.close()
+
+    def publish(self, result: Any) -> None:
+        """progress_cb-compatible: forward one result (dataclass or dict)."""
+        self._send({"event": "result", "result": asdict(result) if is_dataclass(result) else result})
+
+    def close(self, summary: Any = None) -> None:
+        done: dict = {"event": "done"}
+        if summary is not None:
+            done.update(total_freed_mb=summary.total_freed_mb, dry_run=summary.dry_run)
+        self._send(done)
+        server, self._server = self._server, None
+        if server is not None:
+            server.close()
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            for conn in self._clients:
+                conn.close()
+            self._clients.clear()
+
+    def __enter__(self) -> "LiveFeed":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        if self._server is not None:
+            self.close()
+
+
+def attach(path: Path = LIVE_SOCKET) -> Iterator[dict]:
+    """Yield the messages of the scan publishing on path. Raises OSError if none is running."""
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    conn.connect(str(path))
+    with conn, conn.makefile("r", encoding="utf-8") as stream:
+        for line in stream:
+            message = json.loads(line)
+            yield message
+            if message.get("event") == "done":
+                return
@@ -0,0 +1,58 @@
+"""Compiled matcher for target_files glob patterns."""
+
+import fnmatch
+import re
+from typing import Iterable, Optional
+
+_GLOB_CHARS = frozenset("*?[")
+
+
+def _is_literal(text: str) -> bool:
+    return _GLOB_CHARS.isdisjoint(text)
+
+
+class FileMatcher:
+    """
+    Match file names against many glob patterns at once (case-sensitive, like fnmatchcase).
+    Patterns are split into exact names (".DS_Store"), suffixes ("*.log") and a
+    single combined regex for everything else, so a name costs one set lookup
+    per distinct suffix length plus at most one regex search.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self.patterns: tuple[str, ...] = tuple(dict.fromkeys(p for p in patterns if p))
+        self._exact: dict[str, str] = {}
+        # suffix length -> {suffix: pattern}
+        self._suffixes: dict[int, dict[str, str]] = {}
+        others: list[str] = []
+        for pattern in self.patterns:
+            if _is_literal(pattern):
+                self._exact.setdefault(pattern, pattern)
+            elif pattern.startswith("*") and _is_literal(pattern[1:]):
+                suffix = pattern[1:]
+                self._suffixes.setdefault(len(suffix), {}).setdefault(suffix, pattern)
+            else:
+                others.append(pattern)
+        self._suffix_lengths = sorted(self._suffixes)
+        self._others = [(p, re.compile(fnmatch.translate(p))) for p in others]
+        self._combined: Optional[re.Pattern[str]] = None
+        if others:
+            self._combined = re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in others))
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def match(self, name: str) -> Optional[str]:
+        """Return the first pattern (by kind: exact, suffix, other) that matches name, or None."""
+        pattern = self._exact.get(name)
+        if pattern is not None:
+            return pattern
+        for length in self._suffix_lengths:
+            pattern = self._suffixes[length].get(name[-length:] if length else "")
+            if pattern is not None:
+                return pattern
+        if self._combined is not None and self._combined.match(name):
+            for pattern, regex in self._others:
+                if regex.match(name):
+                    return pattern
+        return None
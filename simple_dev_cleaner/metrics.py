@@ -0,0 +1,104 @@
+"""Prometheus textfile-collector export: one .prom file describing the last run."""
+
+import os
+import re
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional
+
+_MB = 1024 * 1024
+_SUCCESS_RE = re.compile(r"^sdevclean_last_success_timestamp_seconds\s+(\S+)$", re.M)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(round(float(value), 3))
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _previous_success(path: Path) -> Optional[float]:
+    try:
+        match = _SUCCESS_RE.search(path.read_text(encoding="utf-8"))
+    except OSError:
+        return None
+    return float(match.group(1)) if match else None
+
+
+def render(
+    results: list[dict],
+    mode: str,
+    phases: dict[str, float],
+    dirs_by_root: Optional[dict[str, int]] = None,
+    last_success: Optional[float] = None,
+    now: Optional[float] = None,
+) -> str:
+    """Text exposition format for one run. Counts and bytes are labelled by scan root and ecosystem."""
+    now = time.time() if now is None else now
+    candidates: dict[tuple[str, str], int] = defaultdict(int)
+    candidate_bytes: dict[tuple[str, str], float] = defaultdict(float)
+    freed: dict[tuple[str, str], float] = defaultdict(float)
+    errors: dict[tuple[str, str], int] = defaultdict(int)
+    for r in results:
+        key = (r.get("root", ""), r.get("ecosystem", ""))
+        size = (r.get("size_mb", 0) or 0) * _MB
+        candidates[key] += 1
+        candidate_bytes[key] += size
+        freed[key] += size if r.get("deleted") else 0.0
+        errors[key] += 1 if r.get("error") else 0
+    if not any(errors.values()):
+        last_success = now
+
+    lines: list[str] = []
+
+    def metric(name: str, kind: str, help_text: str, samples: list[tuple[str, float]]) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(f"{name}{labels} {_value(value)}" for labels, value in samples)
+
+    def by_target(values: dict) -> list[tuple[str, float]]:
+        return [(_labels(root=root, ecosystem=eco), v) for (root, eco), v in sorted(values.items())]
+
+    metric("sdevclean_run_timestamp_seconds", "gauge", "Unix time the last run finished.",
+           [(_labels(mode=mode), now)])
+    if last_success is not None:
+        metric("sdevclean_last_success_timestamp_seconds", "gauge", "Unix time of the last run without errors.",
+               [("", last_success)])
+    metric("sdevclean_phase_seconds", "gauge",
+           "Time spent per phase in the last run (walk is wall time; size and delete are summed over workers).",
+           [(_labels(phase=p), s) for p, s in sorted(phases.items())])
+    if dirs_by_root is not None:
+        metric("sdevclean_dirs_walked", "gauge", "Directories listed in the last run.",
+               [(_labels(root=root), n) for root, n in sorted(dirs_by_root.items())])
+    metric("sdevclean_candidates", "gauge", "Stale targets found in the last run.", by_target(candidates))
+    metric("sdevclean_candidate_bytes", "gauge", "Size of the stale targets found in the last run.",
+           by_target(candidate_bytes))
+    metric("sdevclean_freed_bytes", "gauge", "Bytes deleted or archived in the last run.", by_target(freed))
+    metric("sdevclean_errors", "gauge", "Targets that failed to delete in the last run.", by_target(errors))
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(
+    path: Path,
+    results: list[dict],
+    mode: str,
+    phases: dict[str, float],
+    dirs_by_root: Optional[dict[str, int]] = None,
+) -> None:
+    """
+    Atomically replace path (a node_exporter textfile-collector .prom file).
+    The last success timestamp is carried over from the previous file when this run had errors.
+    """
+    path = Path(path).expanduser()
+    text = render(results, mode, phases, dirs_by_root, _previous_success(path))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Same directory so os.replace is atomic; the collector only reads *.prom.
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
@@ -0,0 +1,223 @@
+"""
+System mode: one root-run job cleaning every user's home on a shared machine.
+
+The root process only discovers homes and starts one run per user, as that
+user (its uid, gid and groups) and with its own config dir, so deletion uses
+the owner's permissions and history/log/locks land in the owner's
+~/.config/simple-dev-cleaner. Scan roots that resolve outside the user's home
+are dropped; the walk itself never follows symlinks.
+"""
+
+import json
+import os
+import pwd
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from simple_dev_cleaner._config import CONFIG_DIR_ENV, LOG_FILE, SYSTEM_CONFIG_FILE
+
+# Accounts below this uid are system accounts.
+MIN_UID = 1000
+_NOLOGIN_SHELLS = ("nologin", "false")
+_USER_CONFIG_DIR = ".config/simple-dev-cleaner"
+
+
+@dataclass(frozen=True)
+class UserHome:
+    name: str
+    uid: int
+    gid: int
+    home: str
+
+
+@dataclass
+class UserReport:
+    user: str
+    home: str
+    config: str = ""
+    found: int = 0
+    found_mb: float = 0.0
+    freed_mb: float = 0.0
+    errors: int = 0
+    partial: bool = False
+    # Why nothing ran: "disabled" in the user's config, or the run's error.
+    skipped: str = ""
+    seconds: float = 0.0
+
+
+def discover_homes(min_uid: int = MIN_UID) -> list[UserHome]:
+    """Login users with a home directory they own (one entry per home)."""
+    homes: list[UserHome] = []
+    seen: set[str] = set()
+    for pw in pwd.getpwall():
+        if pw.pw_uid < min_uid or pw.pw_uid == 65534:
+            continue
+        if os.path.basename(pw.pw_shell or "") in _NOLOGIN_SHELLS:
+            continue
+        home = os.path.realpath(pw.pw_dir)
+        try:
+            st = os.stat(home)
+        except OSError:
+            continue
+        if home in seen or not os.path.isdir(home) or st.st_uid != pw.pw_uid:
+            continue
+        seen.add(home)
+        homes.append(UserHome(pw.pw_name, pw.pw_uid, pw.pw_gid, home))
+    return sorted(homes, key=lambda u: u.name)
+
+
+def confine_scan_dirs(scan_dirs: list[str], home: str) -> list[str]:
+    """scan_dirs resolved (~ is the user's home) and kept only if they stay inside home."""
+    home = os.path.realpath(home)
+    kept: list[str] = []
+    for entry in scan_dirs:
+        if entry == "~" or entry.startswith("~/"):
+            entry = home + entry[1:]
+        path = os.path.realpath(entry)
+        if path == home or path.startswith(home.rstrip("/") + "/"):
+            kept.append(path)
+    return kept
+
+
+def _run_user(user: UserHome, apply: bool, workers: int, default_config: Path) -> UserReport:
+    """Start the per-user run with the user's credentials and collect its JSON report."""
+    report = UserReport(user.name, user.home)
+    env = {
+        "HOME": user.home,
+        "USER": user.name,
+        "LOGNAME": user.name,
+        "PATH": os.environ.get("PATH", "/usr/bin:/bin"),
+        "LANG": os.environ.get("LANG", "C.UTF-8"),
+        CONFIG_DIR_ENV: os.path.join(user.home, _USER_CONFIG_DIR),
+        # So the package is importable from a source checkout too.
+        "PYTHONPATH": str(Path(__file__).resolve().parent.parent),
+    }
+    args = [sys.executable, "-m", "simple_dev_cleaner.multiuser", "--default-config", str(default_config),
+            "--workers", str(workers)]
+    if apply:
+        args.append("--apply")
+    started = time.monotonic()
+    try:
+        proc = subprocess.run(
+            args,
+            env=env,
+            cwd=user.home,
+            user=user.uid,
+            group=user.gid,
+            extra_groups=os.getgrouplist(user.name, user.gid),
+            capture_output=True,
+            text=True,
+        )
+    except OSError as e:
+        report.skipped = str(e)
+        return report
+    report.seconds = round(time.monotonic() - started, 1)
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lines:
+        report.skipped = (proc.stderr.strip().splitlines() or [f"exit {proc.returncode}"])[-1]
+        return report
+    try:
+        data = json.loads(lines[-1])
+    except ValueError:
+        report.skipped = lines[-1]
+        return report
+    for key, value in data.items():
+        if hasattr(report, key) and key not in ("user", "home"):
+            setattr(report, key, value)
+    return report
+
+
+def run_system(
+    apply: bool = False,
+    parallel: int = 4,
+    workers: int = 2,
+    min_uid: int = MIN_UID,
+    default_config: Path = SYSTEM_CONFIG_FILE,
+) -> list[UserReport]:
+    """
+    Clean every user's home (dry run unless apply): up to `parallel` users at a
+    time, each with at most `workers` threads per device and deleting.
+    Must run as root.
+    """
+    if os.geteuid() != 0:
+        raise PermissionError("system mode must run as root")
+    users = discover_homes(min_uid)
+    with ThreadPoolExecutor(max(1, parallel), thread_name_prefix="sdc-user") as pool:
+        reports = list(pool.map(lambda u: _run_user(u, apply, workers, default_config), users))
+    write_system_log(reports, apply)
+    return reports
+
+
+def write_system_log(reports: list[UserReport], apply: bool) -> None:
+    if not reports:
+        return
+    mode = "SYSTEM" if apply else "SYSTEM (dry run)"
+    lines = [f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {mode} — {len(reports)} users"]
+    for r in reports:
+        if r.skipped:
+            lines.append(f"  [{r.user}] {r.home}: skipped ({r.skipped})")
+            continue
+        lines.append(
+            f"  [{r.user}] {r.home}: {r.found} found ({r.found_mb}MB), {r.freed_mb}MB freed, "
+            f"{r.errors} errors{', partial' if r.partial else ''} in {r.seconds}s"
+        )
+    lines.append("")
+    with open(LOG_FILE, "a", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+# ── Per-user run (already running as the user) ──────────────────────────────
+
+def _user_main(apply: bool, workers: int, default_config: Path) -> dict:
+    from dataclasses import replace
+
+    from simple_dev_cleaner.cleaner import CONFIG_PATH, Config, run_scheduled, scan
+
+    home = str(Path.home())
+    config = Config.from_file(CONFIG_PATH)
+    source = str(CONFIG_PATH)
+    if config is None:
+        config = Config.from_file(default_config) or Config()
+        source = str(default_config) if default_config.exists() else ""
+    if not config.enabled:
+        return {"config": source, "skipped": "disabled"}
+    config = replace(
+        config,
+        scan_dirs=confine_scan_dirs(config.scan_dirs, home),
+        workers_per_device=max(1, min(config.workers_per_device, workers)),
+        device_workers={k: max(1, min(v, workers)) for k, v in config.device_workers.items()},
+        delete_workers=max(1, min(config.delete_workers, workers)),
+    )
+    summary = run_scheduled(config) if apply else scan(config, dry_run=True)
+    if summary is None:
+        # Nothing to do (watermarks) or the user's own run holds the lock.
+        return {"config": source}
+    results = summary.results
+    return {
+        "config": source,
+        "found": len(results),
+        "found_mb": round(sum(r.get("size_mb", 0) or 0 for r in results), 1),
+        "freed_mb": summary.total_freed_mb,
+        "errors": sum(1 for r in results if r.get("error")),
+        "partial": summary.partial,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="simple_dev_cleaner.multiuser")
+    parser.add_argument("--apply", action="store_true")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--default-config", default=str(SYSTEM_CONFIG_FILE))
+    args = parser.parse_args(argv)
+    print(json.dumps(_user_main(args.apply, args.workers, Path(args.default_config))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Plan files: record a reviewed dry run and apply it later without rescanning."""
+
+import json
+import os
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Optional
+
+from simple_dev_cleaner.cleaner import (
+    CleanResult,
+    Config,
+    RunSummary,
+    _delete_target,
+    _in_use_index,
+    _write_log,
+)
+from simple_dev_cleaner.lock import run_lock
+from simple_dev_cleaner.usage import forget_deleted
+
+PLAN_VERSION = 1
+
+
+def fingerprint(path: "str | os.PathLike[str]") -> Optional[list[int]]:
+    """(dev, ino, mtime_ns, size) of a path without following symlinks, or None if missing."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return None
+    return [st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size]
+
+
+def write_plan(summary: RunSummary, path: Path) -> int:
+    """Write the summary's results with fingerprints to path (atomically). Return entry count."""
+    entries = []
+    for r in summary.results:
+        fp = fingerprint(r["path"])
+        if fp is not None:
+            entries.append({**r, "fingerprint": fp})
+    data = {"version": PLAN_VERSION, "created": summary.timestamp, "results": entries}
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+    return len(entries)
+
+
+def load_plan(path: Path) -> dict:
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if data.get("version") != PLAN_VERSION:
+        raise ValueError(f"Unsupported plan version: {data.get('version')!r}")
+    return data
+
+
+def apply_plan(plan: dict, progress_cb=None, config: Optional[Config] = None) -> RunSummary:
+    """
+    Delete the plan's targets that still match their fingerprint (one lstat each).
+    Targets that changed or disappeared since planning are skipped, not re-walked.
+    """
+    with run_lock():
+        return _apply(plan, progress_cb, config)
+
+
+def _apply(plan: dict, progress_cb, config: Optional[Config]) -> RunSummary:  # noqa: ANN001
+    results: list[CleanResult] = []
+    total_freed = 0.0
+    entries = plan.get("results", [])
+    in_use = _in_use_index(config)
+    for i, entry in enumerate(entries):
+        result = CleanResult(
+            path=entry["path"],
+            name=entry["name"],
+            size_mb=entry.get("size_mb", 0) or 0,
+            unused_hours=entry.get("unused_hours", 0),
+            deleted=False,
+            is_file=entry.get("is_file", False),
+            ecosystem=entry.get("ecosystem", ""),
+        )
+        current = fingerprint(entry["path"])
+        if current is None:
+            result.skipped = "missing"
+        elif current != entry.get("fingerprint"):
+            result.skipped = "changed"
+        elif in_use.holder(result.path):
+            result.skipped = "in_use"
+        else:
+            try:
+                result.archive = _delete_target(Path(entry["path"]), result.is_file, result.unused_hours, config)
+                result.deleted = True
+                total_freed += result.size_mb
+            except Exception as e:
+                result.error = str(e)
+        results.append(result)
+        if progress_cb:
+            progress_cb(i + 1, len(entries), result)
+
+    summary = RunSummary(
+        timestamp=time.strftime("%Y-%m-%d %H:%M:%S"),
+        results=[asdict(r) for r in results],
+        total_freed_mb=round(total_freed, 1),
+        dry_run=False,
+    )
+    summary.save()
+    _write_log(summary)
+    forget_deleted(summary.results)
+    return summary
@@ -0,0 +1,185 @@
+"""Regrowth tracking: deleted targets that were reinstalled, and per-project staleness thresholds raised to avoid churn."""
+
+import math
+import os
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+try:
+    import tomllib
+except ImportError:
+    import tomli as tomllib  # type: ignore
+
+import tomli_w
+
+from simple_dev_cleaner._config import CONFIG_DIR
+from simple_dev_cleaner.archive import MARKER_SUFFIX
+from simple_dev_cleaner.fs import LOCAL, FileSystem
+
+REGROWTH_FILE = CONFIG_DIR / "regrowth.toml"
+# Left next to a deleted folder (see cleaner._write_marker).
+MARKER_NAME = "install_packages_again"
+_MARKER_RE = re.compile(r"Folder '(?P<name>.+)' removed by Simple Dev Cleaner \(unused for (?P<hours>\d+)h\)")
+# A target reinstalled within CHURN_HOURS of being deleted was deleted too early.
+CHURN_HOURS = 14 * 24
+# A churning project's threshold: MARGIN x the longest it sat idle before it was
+# needed again (unused hours at deletion + hours until reinstalled), capped at
+# MAX_FACTOR x unused_hours.
+MARGIN = 1.5
+MAX_FACTOR = 8
+# Regrowths remembered per project, and for how long.
+KEEP = 5
+FORGET_DAYS = 180
+
+
+@dataclass(frozen=True)
+class Regrowth:
+    path: str
+    # Epoch seconds: when the marker was left, and when the folder came back.
+    deleted_at: int
+    regrown_at: int
+    # Unused hours at deletion.
+    idle_hours: int
+
+    @property
+    def project(self) -> str:
+        return os.path.dirname(self.path)
+
+    @property
+    def gap_hours(self) -> int:
+        return max(0, self.regrown_at - self.deleted_at) // 3600
+
+    @property
+    def churn(self) -> bool:
+        return self.gap_hours <= CHURN_HOURS
+
+
+def _marker(target: Path, fs: FileSystem) -> Optional[tuple[int, int]]:
+    """(deleted_at, unused hours at deletion) from the marker we left for target, if any."""
+    for marker in (target.parent / MARKER_NAME, target.parent / f"{target.name}{MARKER_SUFFIX}"):
+        try:
+            deleted_at = int(fs.lstat(str(marker)).st_mtime)
+            text = fs.read_text(str(marker))
+        except (OSError, ValueError):
+            continue
+        if marker.name == MARKER_NAME:
+            # One marker per project: it names the folder deleted last.
+            m = _MARKER_RE.search(text)
+            if m is None or m.group("name") != target.name:
+                continue
+            return deleted_at, int(m.group("hours"))
+        try:
+            data = tomllib.loads(text)
+        except ValueError:
+            continue
+        # removed = false: the folder was never fully removed, so it did not regrow.
+        if data.get("path") != str(target) or not data.get("removed", True):
+            continue
+        try:
+            return deleted_at, int(data.get("unused_hours", 0))
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def detect(target: Path, fs: FileSystem = LOCAL) -> Optional[Regrowth]:
+    """The regrowth of target if it exists again next to the marker its deletion left."""
+    marker = _marker(target, fs)
+    if marker is None:
+        return None
+    deleted_at, idle_hours = marker
+    try:
+        st = fs.lstat(str(target))
+    except OSError:
+        return None
+    # Creation time where the platform has it; mtime (last install) otherwise.
+    created = int(getattr(st, "st_birthtime", st.st_mtime))
+    return Regrowth(str(target), deleted_at, max(created, deleted_at), idle_hours)
+
+
+class RegrowthLog:
+    """
+    Regrowths seen across runs, per project (the target's parent folder). A
+    project whose targets came back within CHURN_HOURS gets a longer effective
+    unused_hours; its events age out after FORGET_DAYS.
+    """
+
+    def __init__(self, events: Iterable[Regrowth] = ()) -> None:
+        self._lock = threading.Lock()
+        self._events: dict[tuple[str, int], Regrowth] = {(e.path, e.deleted_at): e for e in events}
+
+    def __bool__(self) -> bool:
+        return bool(self._events)
+
+    def record(self, event: Regrowth) -> bool:
+        """Add event; False if it was already known (the marker stays until the next deletion)."""
+        with self._lock:
+            key = (event.path, event.deleted_at)
+            if key in self._events:
+                return False
+            self._events[key] = event
+            return True
+
+    def events(self, project: Optional[str] = None) -> list[Regrowth]:
+        """Events (of one project), newest first."""
+        with self._lock:
+            found = [e for e in self._events.values() if project is None or e.project == project]
+        return sorted(found, key=lambda e: -e.regrown_at)
+
+    def threshold(self, project: str, unused_hours: int) -> int:
+        """Effective unused_hours for targets in project."""
+        idle = [e.idle_hours + e.gap_hours for e in self.events(project) if e.churn]
+        if not idle:
+            return unused_hours
+        raised = math.ceil(max(idle) * MARGIN)
+        return max(unused_hours, min(raised, unused_hours * MAX_FACTOR))
+
+    def projects(self) -> list[str]:
+        """Projects with at least one churn event, most recent first."""
+        seen: dict[str, None] = {}
+        for e in self.events():
+            if e.churn:
+                seen.setdefault(e.project)
+        return list(seen)
+
+    def save(self, path: Path = REGROWTH_FILE) -> None:
+        """Write the last KEEP events per project younger than FORGET_DAYS."""
+        cutoff = time.time() - FORGET_DAYS * 86400
+        kept: list[Regrowth] = []
+        per_project: dict[str, int] = {}
+        for e in self.events():
+            if e.regrown_at < cutoff or per_project.get(e.project, 0) >= KEEP:
+                continue
+            per_project[e.project] = per_project.get(e.project, 0) + 1
+            kept.append(e)
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(tomli_w.dumps({"regrowths": [asdict(e) for e in kept]}), encoding="utf-8")
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path = REGROWTH_FILE) -> "RegrowthLog":
+        try:
+            with open(path, "rb") as f:
+                data = tomllib.load(f)
+            return cls(Regrowth(**e) for e in data.get("regrowths", []))
+        except (OSError, ValueError, TypeError):
+            return cls()
+
+
+def record_regrowths(events: Iterable[Regrowth], path: Path = REGROWTH_FILE) -> None:
+    """
+    Merge a run's regrowths into the saved log. Not locked: an event lost to a
+    concurrent run is seen again next time, since the marker is still there.
+    """
+    events = list(events)
+    if not events:
+        return
+    log = RegrowthLog.load(path)
+    if any([log.record(e) for e in events]):
+        log.save(path)
@@ -0,0 +1,39 @@
+"""Auto-delete rules: results confirmed for deletion without review (pipelined clean)."""
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+@dataclass(frozen=True)
+class DeleteRule:
+    """
+    A result matches when every condition that is set holds, e.g.
+    {name = "node_modules", min_days = 30} or {min_size_mb = 500}.
+    """
+    name: str = ""
+    ecosystem: str = ""
+    min_days: float = 0
+    min_size_mb: float = 0
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Optional["DeleteRule"]:
+        """Rule from a config table; None for tables without any condition (they would match everything)."""
+        rule = cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+        return rule if rule != cls() else None
+
+    def matches(self, result: Any) -> bool:
+        """result is a CleanResult (attributes) or a result dict."""
+        get = result.get if isinstance(result, dict) else lambda key: getattr(result, key)
+        if self.name and get("name") != self.name:
+            return False
+        if self.ecosystem and get("ecosystem") != self.ecosystem:
+            return False
+        if self.min_days and (get("unused_hours") or 0) < self.min_days * 24:
+            return False
+        if self.min_size_mb and (get("size_mb") or 0) < self.min_size_mb:
+            return False
+        return True
+
+
+def parse_rules(tables: list[dict]) -> list[DeleteRule]:
+    return [rule for rule in map(DeleteRule.from_dict, tables) if rule is not None]
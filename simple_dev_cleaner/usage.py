@@ -0,0 +1,153 @@
+"""Disk-usage index: aggregated sizes from the scan roots down into each target's packages."""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+from simple_dev_cleaner._config import CONFIG_DIR
+
+USAGE_FILE = CONFIG_DIR / "usage.json"
+USAGE_VERSION = 1
+# Directories this many levels below a target are itemized (venv/lib/python3.x/site-packages/pkg).
+BREAKDOWN_DEPTH = 4
+# Entries inside a target smaller than this are folded into their parent.
+_MIN_NODE_BYTES = 1024 * 1024
+
+
+class SizeIndex:
+    """
+    Bytes per path, each node holding the total of everything recorded below it.
+    Targets are added once sized (with their per-directory breakdown); every
+    ancestor up to the scan root gets their size, so any level can be expanded
+    with dictionary lookups only.
+    """
+
+    def __init__(
+        self,
+        sizes: Optional[dict[str, int]] = None,
+        roots: Iterable[str] = (),
+        timestamp: str = "",
+        partial: bool = False,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._sizes: dict[str, int] = dict(sizes or {})
+        self.roots: list[str] = list(roots)
+        self.timestamp = timestamp
+        self.partial = partial
+        self._children: Optional[dict[str, list[str]]] = None
+
+    def __bool__(self) -> bool:
+        return bool(self._sizes)
+
+    def _ancestors(self, path: str) -> Iterable[str]:
+        """Parents of path up to (and including) its scan root, or up to / outside any root."""
+        roots = set(self.roots)
+        while path not in roots:
+            parent = os.path.dirname(path)
+            if parent == path:
+                return
+            path = parent
+            yield path
+
+    def add(self, path: str, own: dict[str, int]) -> None:
+        """
+        Record a sized target. own maps path and directories below it to the bytes
+        of the files directly inside them (see BREAKDOWN_DEPTH).
+        """
+        totals: dict[str, int] = {}
+        for sub, size in own.items():
+            while True:
+                totals[sub] = totals.get(sub, 0) + size
+                if sub == path or len(sub) <= len(path):
+                    break
+                sub = os.path.dirname(sub)
+        total = totals.get(path, 0)
+        with self._lock:
+            self._children = None
+            for sub, size in totals.items():
+                if sub == path or size >= _MIN_NODE_BYTES:
+                    self._sizes[sub] = self._sizes.get(sub, 0) + size
+            for parent in self._ancestors(path):
+                self._sizes[parent] = self._sizes.get(parent, 0) + total
+
+    def add_file(self, path: str, size: int) -> None:
+        """Record a target file; small ones (logs, .DS_Store) are left out."""
+        if size >= _MIN_NODE_BYTES:
+            self.add(path, {path: size})
+
+    def remove(self, path: str) -> None:
+        """Forget path and everything below it (e.g. once deleted)."""
+        with self._lock:
+            size = self._sizes.get(path)
+            if size is None:
+                return
+            prefix = path.rstrip("/") + "/"
+            for sub in [p for p in self._sizes if p == path or p.startswith(prefix)]:
+                del self._sizes[sub]
+            for parent in self._ancestors(path):
+                left = self._sizes.get(parent, 0) - size
+                if left > 0:
+                    self._sizes[parent] = left
+                else:
+                    self._sizes.pop(parent, None)
+            self._children = None
+
+    def size(self, path: str) -> int:
+        return self._sizes.get(path, 0)
+
+    def children(self, path: str) -> list[tuple[str, int]]:
+        """Direct children of path with their sizes, largest first."""
+        with self._lock:
+            if self._children is None:
+                tree: dict[str, list[str]] = {}
+                for p in self._sizes:
+                    parent = os.path.dirname(p)
+                    if parent != p and parent in self._sizes:
+                        tree.setdefault(parent, []).append(p)
+                self._children = tree
+            kids = self._children.get(path, [])
+            return sorted(((p, self._sizes[p]) for p in kids), key=lambda item: -item[1])
+
+    def top(self) -> list[tuple[str, int]]:
+        """Scan roots that have anything recorded, largest first."""
+        return sorted(((r, self._sizes[r]) for r in self.roots if r in self._sizes), key=lambda item: -item[1])
+
+    def save(self, path: Path = USAGE_FILE) -> None:
+        data = {
+            "version": USAGE_VERSION,
+            "timestamp": self.timestamp or time.strftime("%Y-%m-%d %H:%M:%S"),
+            "partial": self.partial,
+            "roots": self.roots,
+            "sizes": self._sizes,
+        }
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path = USAGE_FILE) -> Optional["SizeIndex"]:
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != USAGE_VERSION:
+            return None
+        return cls(data.get("sizes"), data.get("roots", []), data.get("timestamp", ""), data.get("partial", False))
+
+
+def forget_deleted(results: list[dict], path: Path = USAGE_FILE) -> None:
+    """Drop deleted results from the saved index so the explorer matches the disk."""
+    deleted = [r["path"] for r in results if r.get("deleted")]
+    if not deleted:
+        return
+    index = SizeIndex.load(path)
+    if index is None:
+        return
+    for p in deleted:
+        index.remove(p)
+    index.save(path)
@@ -0,0 +1,217 @@
+"""Fast venv sizing from the installed distributions' dist-info RECORD files."""
+
+import csv
+import os
+import random
+from collections import defaultdict
+from typing import Callable, Optional
+
+from simple_dev_cleaner.fs import LOCAL, FileSystem
+
+# Recorded files stat'ed per distribution to catch packages changed since install.
+CHECKS_PER_DIST = 2
+# Install-time .pyc are listed without a size: the PYC_SAMPLE with the largest
+# sources are stat'ed, the rest estimated from their sources' recorded sizes
+# and the .pyc/.py ratio of PYC_SAMPLE random ones.
+PYC_SAMPLE = 64
+
+# walk(path, own) -> bytes under path, adding per-directory bytes to own.
+Walk = Callable[[str, Optional[dict[str, int]]], int]
+
+
+class _Dist:
+    def __init__(self) -> None:
+        # Top-level name in site-packages -> recorded bytes.
+        self.sizes: dict[str, int] = defaultdict(int)
+        self.sized_paths: list[tuple[str, int]] = []
+        # .pyc listed without a size: (path, top, recorded size of its .py).
+        self.pyc: list[tuple[str, str, int]] = []
+        # Other files listed without a size (RECORD itself, .pyc without a source): (path, top).
+        self.unsized: list[tuple[str, str]] = []
+
+    def tops(self) -> set[str]:
+        return set(self.sizes) | {top for _, top, _ in self.pyc} | {top for _, top in self.unsized}
+
+
+def _pyc_source(rel: str) -> str:
+    """pkg/__pycache__/mod.cpython-311.pyc -> pkg/mod.py"""
+    folder, name = os.path.split(rel)
+    if os.path.basename(folder) == "__pycache__":
+        folder = os.path.dirname(folder)
+    return os.path.join(folder, name.split(".", 1)[0] + ".py")
+
+
+def _read_record(site: str, dist_info: str, fs: FileSystem) -> Optional[_Dist]:
+    try:
+        text = fs.read_text(os.path.join(site, dist_info, "RECORD"))
+    except (OSError, ValueError):
+        return None
+    dist = _Dist()
+    recorded: dict[str, int] = {}
+    sizeless: list[str] = []
+    try:
+        for row in csv.reader(text.splitlines()):
+            if not row or not row[0]:
+                continue
+            rel = os.path.normpath(row[0])
+            # Scripts in bin/ are outside site-packages and walked with the rest of the venv.
+            if rel.startswith("..") or os.path.isabs(rel):
+                continue
+            size = row[2] if len(row) > 2 else ""
+            if size.isdigit():
+                recorded[rel] = int(size)
+            else:
+                sizeless.append(rel)
+    except (csv.Error, ValueError):
+        # Corrupt RECORD (NUL bytes, oversized fields): the distribution is walked instead.
+        return None
+    for rel, size in recorded.items():
+        dist.sizes[rel.split(os.sep, 1)[0]] += size
+        dist.sized_paths.append((os.path.join(site, rel), size))
+    for rel in sizeless:
+        top = rel.split(os.sep, 1)[0]
+        source = recorded.get(_pyc_source(rel), 0) if rel.endswith(".pyc") else 0
+        if source:
+            dist.pyc.append((os.path.join(site, rel), top, source))
+        else:
+            dist.unsized.append((os.path.join(site, rel), top))
+    return dist
+
+
+def _changed(dist: _Dist, fs: FileSystem, rng: random.Random) -> bool:
+    """Whether a sample of the recorded files no longer matches RECORD."""
+    for path, size in rng.sample(dist.sized_paths, min(CHECKS_PER_DIST, len(dist.sized_paths))):
+        try:
+            if fs.lstat(path).st_size != size:
+                return True
+        except OSError:
+            return True
+    return False
+
+
+def _site_size(site: str, fs: FileSystem, walk: Walk, own: Optional[dict[str, int]], rng: random.Random) -> int:
+    entries = fs.scandir(site)
+    dists = [d for d in (_read_record(site, e.name, fs) for e in entries if e.name.endswith(".dist-info")) if d]
+    recorded: dict[str, float] = defaultdict(float)
+    pyc_sources: dict[str, int] = defaultdict(int)
+    dirty: set[str] = set()
+    clean: list[_Dist] = []
+    for dist in dists:
+        if _changed(dist, fs, rng):
+            dirty.update(dist.tops())
+        else:
+            clean.append(dist)
+    pyc = sorted((item for dist in clean for item in dist.pyc), key=lambda item: -item[2])
+    exact = [(path, top) for path, top, _ in pyc[:PYC_SAMPLE]]
+    rest = pyc[PYC_SAMPLE:]
+    for dist in clean:
+        for top, size in dist.sizes.items():
+            recorded[top] += size
+    for path, top in exact + [item for dist in clean for item in dist.unsized]:
+        try:
+            recorded[top] += fs.lstat(path).st_size
+        except OSError:
+            recorded[top] += 0  # .pyc not compiled after all
+    for _, top, source in rest:
+        pyc_sources[top] += source
+
+    ratio = 0.0
+    if rest:
+        sampled = rng.sample(rest, min(PYC_SAMPLE, len(rest)))
+        compiled = 0
+        for path, _, _ in sampled:
+            try:
+                compiled += fs.lstat(path).st_size
+            except OSError:
+                pass
+        ratio = compiled / sum(source for _, _, source in sampled)
+
+    size = 0
+    for entry in entries:
+        top = entry.name
+        if top not in dirty and (top in recorded or top in pyc_sources):
+            part = int(recorded.get(top, 0) + ratio * pyc_sources.get(top, 0))
+            if own is not None:
+                own[entry.path] = own.get(entry.path, 0) + part
+        elif entry.is_dir(follow_symlinks=False):
+            part = walk(entry.path, own)
+        else:
+            try:
+                part = entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                part = 0
+            if own is not None:
+                own[site] = own.get(site, 0) + part
+        size += part
+    return size
+
+
+def _site_packages(venv: str, fs: FileSystem) -> list[str]:
+    """site-packages directories of a venv (lib/pythonX.Y/ on POSIX, Lib/ on Windows)."""
+    found = []
+    for lib in fs.scandir(venv):
+        if lib.name not in ("lib", "Lib") or not lib.is_dir(follow_symlinks=False):
+            continue
+        candidates = [lib.path] + [
+            e.path for e in fs.scandir(lib.path) if e.name.startswith("python") and e.is_dir(follow_symlinks=False)
+        ]
+        for candidate in candidates:
+            site = os.path.join(candidate, "site-packages")
+            if fs.is_dir(site):
+                found.append(site)
+    return found
+
+
+def record_size(
+    venv: str,
+    walk: Walk,
+    fs: FileSystem = LOCAL,
+    own: Optional[dict[str, int]] = None,
+    dirs: Optional[list[tuple[str, int]]] = None,
+) -> Optional[int]:
+    """
+    Bytes in a venv, reading site-packages from its RECORD files: recorded sizes
+    are summed, .pyc listed without one are estimated from a few stats, and
+    only what no RECORD covers (bin/, packages without metadata, distributions
+    whose sampled files changed) is walked. .pyc written after install are not
+    in any RECORD and are left out. None if the venv has no site-packages.
+    With dirs, the directories listed here (the venv down to site-packages,
+    which installs and uninstalls change) are appended with their mtime_ns.
+    """
+    try:
+        sites = _site_packages(venv, fs)
+    except OSError:
+        return None
+    if not sites:
+        return None
+    rng = random.Random(venv)
+    size = 0
+
+    def outside(path: str) -> None:
+        """Walk everything under path except the site-packages directories."""
+        nonlocal size
+        if dirs is not None:
+            dirs.append((path, fs.lstat(path).st_mtime_ns))
+        for entry in fs.scandir(path):
+            if entry.path in sites:
+                if dirs is not None:
+                    dirs.append((entry.path, fs.lstat(entry.path).st_mtime_ns))
+                size += _site_size(entry.path, fs, walk, own, rng)
+            elif any(site.startswith(entry.path + os.sep) for site in sites):
+                outside(entry.path)
+            elif entry.is_dir(follow_symlinks=False):
+                size += walk(entry.path, own)
+            else:
+                try:
+                    part = entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
+                size += part
+                if own is not None:
+                    own[path] = own.get(path, 0) + part
+
+    try:
+        outside(venv)
+    except OSError:
+        return None
+    return size
@@ -0,0 +1,248 @@
+"""Device-aware traversal helpers and per-device task scheduling."""
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from simple_dev_cleaner.autotune import MAX_WORKERS, TunerSet
+from simple_dev_cleaner.fs import LOCAL, FileSystem
+from simple_dev_cleaner.regrowth import Regrowth
+from simple_dev_cleaner.usage import SizeIndex
+
+# Upper bound of threads per device pool; the effective limit is enforced by the scheduler.
+_MAX_WORKERS = MAX_WORKERS
+# Marker key for prefix-tree nodes that are scan roots.
+_ROOT = object()
+
+
+def device_of(path: "str | os.PathLike[str]", fs: FileSystem = LOCAL) -> Optional[int]:
+    """st_dev of a path (following symlinks), or None if it can't be stat'ed."""
+    try:
+        return fs.stat(str(path)).st_dev
+    except OSError:
+        return None
+
+
+def child_device(entry: "os.DirEntry[str]") -> Optional[int]:
+    """st_dev of a directory entry without following symlinks."""
+    try:
+        return entry.stat(follow_symlinks=False).st_dev
+    except OSError:
+        return None
+
+
+def normalize_roots(
+    scan_dirs: list[str], one_file_system: bool = True, fs: FileSystem = LOCAL
+) -> tuple[list[tuple[str, int]], dict[str, str]]:
+    """
+    Reduce scan_dirs to the set of roots that must actually be walked.
+    Entries are resolved (symlinks, ~) and made unique by (dev, ino); entries that
+    live under another root are dropped because the parent's walk already covers
+    them (unless one_file_system keeps the parent's walk off their device).
+    Return ([(resolved_path, dev), ...], {redundant_entry: covering_entry}).
+    """
+    resolved: list[tuple[Path, Any, str]] = []
+    for entry in scan_dirs:
+        try:
+            path = Path(fs.resolve(entry))
+            st = fs.stat(str(path))
+        except (OSError, RuntimeError):
+            continue
+        if fs.is_dir(str(path)):
+            resolved.append((path, st, entry))
+
+    redundant: dict[str, str] = {}
+    seen: dict[tuple[int, int], str] = {}
+    # Prefix tree over path parts; a node holding _ROOT is a walked root.
+    trie: dict = {}
+    roots: list[tuple[str, int]] = []
+    for path, st, entry in sorted(resolved, key=lambda item: len(item[0].parts)):
+        key = (st.st_dev, st.st_ino)
+        if key in seen:
+            redundant[entry] = seen[key]
+            continue
+        seen[key] = entry
+        node = trie
+        covering: Optional[tuple[str, int]] = None
+        for part in path.parts:
+            node = node.setdefault(part, {})
+            if _ROOT in node:
+                covering = node[_ROOT]
+        if covering is not None and (not one_file_system or covering[1] == st.st_dev):
+            redundant[entry] = covering[0]
+            continue
+        node[_ROOT] = (entry, st.st_dev)
+        roots.append((str(path), st.st_dev))
+    return roots, redundant
+
+
+class ScanStats:
+    """
+    Live walk counters. Workers add to them once per directory batch; readers
+    (e.g. a progress display) sample them at their own pace instead of being
+    called back on every result.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        self.dirs_visited = 0
+        self.entries = 0
+        self.bytes_sized = 0
+        self.found = 0
+        self.current_root = ""
+        # Directories listed per scan root (updated by the scan's main thread).
+        self.dirs_by_root: dict[str, int] = {}
+        # Seconds per phase, summed over workers ("size", "delete").
+        self.phases: dict[str, float] = {}
+        # Aggregated sizes of the targets sized so far (saved for the explorer).
+        self.usage = SizeIndex()
+        # Deleted targets found reinstalled next to their marker.
+        self.regrown: list[Regrowth] = []
+
+    def add_dir(self, entries: int, size: int = 0) -> None:
+        """Record one listed directory, its entry count and the bytes sized in it."""
+        with self._lock:
+            self.dirs_visited += 1
+            self.entries += entries
+            self.bytes_sized += size
+
+    def add_phase(self, phase: str, seconds: float) -> None:
+        """Add time spent on one target's phase (called once per target, not per entry)."""
+        with self._lock:
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def add_regrowth(self, event: Regrowth) -> None:
+        with self._lock:
+            self.regrown.append(event)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def entries_per_second(self) -> float:
+        elapsed = self.elapsed
+        return self.entries / elapsed if elapsed > 0 else 0.0
+
+
+class YieldIndex:
+    """
+    How much reclaimable space past runs found under each directory.
+    Every past result credits its size (latest run wins per path) to all of its
+    ancestors, so score(dir) is the MB historically found anywhere below dir.
+    """
+
+    def __init__(self, scores: Optional[dict[str, float]] = None) -> None:
+        self._scores: dict[str, float] = scores or {}
+
+    def __bool__(self) -> bool:
+        return bool(self._scores)
+
+    @classmethod
+    def from_runs(cls, runs: Iterable[dict]) -> "YieldIndex":
+        """Build from history runs (newest first, as RunSummary.load_all returns them)."""
+        sizes: dict[str, float] = {}
+        for run in runs:
+            for r in run.get("results", []):
+                sizes.setdefault(r.get("path", ""), r.get("size_mb", 0) or 0)
+        scores: dict[str, float] = {}
+        for path, size in sizes.items():
+            if not path or size <= 0:
+                continue
+            parent = os.path.dirname(path)
+            while True:
+                scores[parent] = scores.get(parent, 0.0) + size
+                up = os.path.dirname(parent)
+                if up == parent:
+                    break
+                parent = up
+        return cls(scores)
+
+    def score(self, path: str) -> float:
+        return self._scores.get(path, 0.0)
+
+
+class DeviceScheduler:
+    """
+    Run tasks on one thread pool per device (st_dev).
+    Each device has its own concurrency limit, so a slow USB disk or network
+    share only ties up its own workers and never holds up the fast local disk.
+    Tasks are queued here (lowest priority value first, FIFO among equals) and
+    handed to the device pool while it has free slots. With tuners, the limit of
+    each device they have a tuner for is the tuner's current one.
+    """
+
+    def __init__(
+        self, default_limit: int = 4, limits: Optional[dict[int, int]] = None, tuners: Optional[TunerSet] = None
+    ) -> None:
+        self.default_limit = max(1, int(default_limit))
+        self.limits: dict[int, int] = dict(limits or {})
+        self.tuners = tuners
+        self._queues: dict[int, list] = {}
+        self._seq = itertools.count()
+        self._pools: dict[int, ThreadPoolExecutor] = {}
+        self._inflight: dict[int, int] = {}
+        self._running: dict[Future, tuple[int, Any]] = {}
+
+    def limit(self, dev: int) -> int:
+        tuner = self.tuners.get(dev) if self.tuners is not None else None
+        if tuner is not None:
+            return tuner.limit
+        return max(1, min(_MAX_WORKERS, self.limits.get(dev, self.default_limit)))
+
+    def submit(self, dev: int, tag: Any, fn: Callable[..., Any], *args: Any, priority: float = 0.0) -> None:
+        """Queue fn(*args) on the pool of device dev. tag is returned with its result."""
+        heapq.heappush(self._queues.setdefault(dev, []), (priority, next(self._seq), tag, fn, args))
+        self._pump(dev)
+
+    def discard(self, predicate: Callable[[Any], bool]) -> None:
+        """Drop queued (not yet running) tasks whose tag matches predicate."""
+        for dev, queue in self._queues.items():
+            kept = [item for item in queue if not predicate(item[2])]
+            heapq.heapify(kept)
+            self._queues[dev] = kept
+
+    def _pump(self, dev: int) -> None:
+        queue = self._queues.get(dev)
+        while queue and self._inflight.get(dev, 0) < self.limit(dev):
+            _, _, tag, fn, args = heapq.heappop(queue)
+            pool = self._pools.get(dev)
+            if pool is None:
+                pool = ThreadPoolExecutor(max_workers=_MAX_WORKERS, thread_name_prefix=f"sdc-dev{dev}")
+                self._pools[dev] = pool
+            future = pool.submit(fn, *args)
+            self._running[future] = (dev, tag)
+            self._inflight[dev] = self._inflight.get(dev, 0) + 1
+        if not queue and self.tuners is not None and self._inflight.get(dev, 0) < self.limit(dev):
+            tuner = self.tuners.get(dev)
+            if tuner is not None:
+                tuner.starved()
+
+    def results(self) -> Iterator[tuple[Any, Future]]:
+        """Yield (tag, future) as tasks finish. More tasks may be submitted while iterating."""
+        while self._running:
+            done, _ = wait(list(self._running), return_when=FIRST_COMPLETED)
+            for future in done:
+                dev, tag = self._running.pop(future)
+                self._inflight[dev] -= 1
+                self._pump(dev)
+                yield tag, future
+
+    def shutdown(self) -> None:
+        for queue in self._queues.values():
+            queue.clear()
+        for pool in self._pools.values():
+            pool.shutdown(wait=True)
+        self._pools.clear()
+
+    def __enter__(self) -> "DeviceScheduler":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.shutdown()